@@ -1235,7 +1235,7 @@ def track(
         table.add_row(tk, res["signal"])
     console.print(table)
     console.print(f"Return: {metrics[0]:.2f} Risk: {metrics[1]:.2f}")
-    console.print(f"Adjustments: {adjustments}")
+    console.print(f"Adjustments: {dict(adjustments)}")
 
 
 app.add_typer(models_app, name="models")
@@ -1,15 +1,94 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+import datetime
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-import questionary
-from rich.console import Console
+import requests
+import typer
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson is optional
+    orjson = None
 
 from tradingagents.auth import AuthClient, AuthenticationError
+from tradingagents.auth.auth_client import _default_client
 
 from cli.models import AnalystType
 
 
-console = Console()
+@functools.lru_cache(maxsize=1)
+def _console():
+    from rich.console import Console
+
+    return Console()
+
+
+@functools.lru_cache(maxsize=None)
+def _prompt_style(name: str):
+    """Build the named questionary Style once and reuse it across prompts."""
+    import questionary
+
+    return questionary.Style(_STYLE_RULES[name])
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj, *, sort_keys: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys).encode("utf-8")
+
+
+_MODELS_CACHE_PATH = Path(
+    os.environ.get(
+        "TRADINGAGENTS_MODELS_PATH",
+        Path.home() / ".tradingagents" / "cache" / "models.json",
+    )
+)
+_MODELS_CACHE_TTL = 600  # seconds
+
+_PARSED_CATALOG_CACHE: "OrderedDict[bytes, List[ProviderInfo]]" = OrderedDict()
+_PARSED_CATALOG_CACHE_SIZE = 4
+
+_STYLE_RULES: Dict[str, List[Tuple[str, str]]] = {
+    "green": [
+        ("text", "fg:green"),
+        ("highlighted", "noinherit"),
+    ],
+    "checkbox": [
+        ("checkbox-selected", "fg:green"),
+        ("selected", "fg:green noinherit"),
+        ("highlighted", "noinherit"),
+        ("pointer", "noinherit"),
+    ],
+    "yellow": [
+        ("selected", "fg:yellow noinherit"),
+        ("highlighted", "fg:yellow noinherit"),
+        ("pointer", "fg:yellow noinherit"),
+    ],
+    "magenta": [
+        ("selected", "fg:magenta noinherit"),
+        ("highlighted", "fg:magenta noinherit"),
+        ("pointer", "fg:magenta noinherit"),
+    ],
+}
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
 ANALYST_ORDER = [
     ("Market Analyst", AnalystType.MARKET),
@@ -19,57 +98,107 @@ ANALYST_ORDER = [
 ]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelInfo:
     id: str
     display_name: str
-    capabilities: set[str]
+    capabilities: frozenset[str]
 
+    def __post_init__(self) -> None:
+        # Callers may pass any iterable; freeze it so the model stays hashable
+        # and can key the cached Choice lists.
+        if not isinstance(self.capabilities, frozenset):
+            object.__setattr__(self, "capabilities", frozenset(self.capabilities))
 
-@dataclass
+
+# Providers compare and hash by identity so they can key the Choice caches.
+@dataclass(slots=True, frozen=True, eq=False)
 class ProviderInfo:
     id: str
     display_name: str
     base_url: Optional[str]
     models: List[ModelInfo]
+    models_by_capability: Dict[str, List[ModelInfo]] = field(
+        default_factory=dict, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if not self.models_by_capability:
+            object.__setattr__(
+                self, "models_by_capability", _index_by_capability(self.models)
+            )
+
+
+def _index_by_capability(models: List[ModelInfo]) -> Dict[str, List[ModelInfo]]:
+    index: Dict[str, List[ModelInfo]] = {}
+    for model in models:
+        for capability in model.capabilities:
+            index.setdefault(capability, []).append(model)
+    return index
 
 
-def _normalize_capabilities(raw_caps) -> set[str]:
+_DEFAULT_CAPS = frozenset({sys.intern("quick"), sys.intern("deep")})
+
+
+def _normalize_capabilities(raw_caps) -> frozenset[str]:
     if isinstance(raw_caps, str):
-        return {raw_caps.lower()}
-    if isinstance(raw_caps, (list, tuple, set)):
-        return {str(cap).lower() for cap in raw_caps if cap}
-    return set()
+        return frozenset({sys.intern(raw_caps.lower())})
+    if isinstance(raw_caps, (list, tuple, set, frozenset)):
+        return frozenset(sys.intern(str(cap).lower()) for cap in raw_caps if cap)
+    return frozenset()
 
 
 def _parse_providers(payload: dict) -> List[ProviderInfo]:
+    key = hashlib.blake2b(_json_dumps(payload, sort_keys=True)).digest()
+    cached = _PARSED_CATALOG_CACHE.get(key)
+    if cached is not None:
+        _PARSED_CATALOG_CACHE.move_to_end(key)
+        return list(cached)
+
     providers: List[ProviderInfo] = []
+    # The fallback chains below are unrolled with the most common key first
+    # and ``get`` bound locally, since this loop runs once per catalog model.
     for provider in payload.get("providers", []):
-        provider_id = provider.get("id") or provider.get("provider") or provider.get("name")
+        provider_get = provider.get
+        provider_id = provider_get("id")
         if not provider_id:
-            continue
-        display_name = provider.get("display_name") or provider.get("name") or provider_id
-        base_url = provider.get("base_url") or provider.get("url")
+            provider_id = provider_get("provider")
+            if not provider_id:
+                provider_id = provider_get("name")
+                if not provider_id:
+                    continue
+        display_name = provider_get("display_name")
+        if not display_name:
+            display_name = provider_get("name") or provider_id
+        base_url = provider_get("base_url")
+        if not base_url:
+            base_url = provider_get("url")
         models: List[ModelInfo] = []
-        for model in provider.get("models", []):
+        append_model = models.append
+        for model in provider_get("models", []):
             if isinstance(model, str):
-                models.append(
+                append_model(
                     ModelInfo(
                         id=model,
                         display_name=model,
-                        capabilities={"quick", "deep"},
+                        capabilities=_DEFAULT_CAPS,
                     )
                 )
                 continue
-            model_id = model.get("id") or model.get("model")
+            model_get = model.get
+            model_id = model_get("id")
             if not model_id:
-                continue
-            display = model.get("display_name") or model.get("name") or model_id
-            capabilities = _normalize_capabilities(
-                model.get("capabilities") or model.get("tags") or []
-            )
-            capabilities = capabilities or {"quick", "deep"}
-            models.append(
+                model_id = model_get("model")
+                if not model_id:
+                    continue
+            display = model_get("display_name")
+            if not display:
+                display = model_get("name") or model_id
+            raw_caps = model_get("capabilities")
+            if not raw_caps:
+                raw_caps = model_get("tags") or []
+            capabilities = _normalize_capabilities(raw_caps) or _DEFAULT_CAPS
+            append_model(
                 ModelInfo(id=model_id, display_name=display, capabilities=capabilities)
             )
 
@@ -79,23 +208,99 @@ def _parse_providers(payload: dict) -> List[ProviderInfo]:
                 display_name=display_name,
                 base_url=base_url,
                 models=models,
+                models_by_capability=_index_by_capability(models),
             )
         )
-    return providers
 
+    _PARSED_CATALOG_CACHE[key] = providers
+    if len(_PARSED_CATALOG_CACHE) > _PARSED_CATALOG_CACHE_SIZE:
+        _PARSED_CATALOG_CACHE.popitem(last=False)
+    return list(providers)
+
+
+def _models_sync_marker() -> Path:
+    return _MODELS_CACHE_PATH.with_name(".last_sync")
 
-def load_model_catalog(auth_client: Optional[AuthClient] = None) -> List[ProviderInfo]:
-    """Fetch the model catalog from the auth service."""
 
-    client = auth_client or AuthClient()
+def _remote_models_disabled() -> bool:
+    value = os.environ.get("TRADINGAGENTS_DISABLE_REMOTE_MODELS", "")
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _read_cached_catalog(max_age: Optional[float] = None) -> Optional[dict]:
+    """Return the cached discovery payload, or ``None`` if missing/too old."""
+
+    if max_age is not None:
+        try:
+            age = time.time() - _models_sync_marker().stat().st_mtime
+        except OSError:
+            return None
+        if age >= max_age:
+            return None
     try:
-        payload = client.discover_models()
-    except AuthenticationError:
-        raise
-    except Exception as exc:  # pragma: no cover - defensive
-        raise AuthenticationError(f"Unexpected error while fetching models: {exc}")
+        payload = _json_loads(_MODELS_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
 
-    providers = _parse_providers(payload or {})
+def _write_cached_catalog(payload: dict) -> None:
+    try:
+        _MODELS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic replace without fsync: a catalog lost on crash is refetched.
+        tmp_path = _MODELS_CACHE_PATH.with_name(_MODELS_CACHE_PATH.name + ".tmp")
+        tmp_path.write_bytes(_json_dumps(payload))
+        os.replace(tmp_path, _MODELS_CACHE_PATH)
+        _models_sync_marker().touch()
+    except OSError:
+        # The cache is an optimisation only; never fail discovery because of it.
+        pass
+
+
+def load_model_catalog(auth_client: Optional[AuthClient] = None) -> List[ProviderInfo]:
+    """Fetch the model catalog, serving it from the on-disk cache when fresh.
+
+    A catalog synced less than ``_MODELS_CACHE_TTL`` seconds ago is reused as
+    is. Otherwise the auth service is queried and the cache refreshed; if that
+    request fails, a stale cached catalog is used instead when one exists.
+    """
+
+    if _remote_models_disabled():
+        payload = _read_cached_catalog()
+        if payload is None:
+            raise AuthenticationError(
+                "Remote model discovery is disabled and no cached catalog is available."
+            )
+    else:
+        payload = _read_cached_catalog(max_age=_MODELS_CACHE_TTL)
+
+    if payload is None:
+        client = auth_client or _default_client()
+        try:
+            fetched = client.discover_models()
+        except AuthenticationError:
+            # Revoked consent or a failed re-login must reach the caller; a
+            # stale catalog would only hide it.
+            raise
+        except requests.RequestException as exc:
+            payload = _read_cached_catalog()
+            if payload is None:
+                raise AuthenticationError(f"Unexpected error while fetching models: {exc}") from exc
+            _console().print(
+                f"[yellow]Model discovery failed ({exc}); using the cached model catalog.[/yellow]"
+            )
+        except Exception as exc:
+            raise AuthenticationError(f"Unexpected error while fetching models: {exc}") from exc
+        else:
+            providers = _parse_providers(fetched or {})
+            if not providers:
+                raise AuthenticationError("Model discovery returned no providers.")
+            # Only a usable catalog is cached, so an empty reply is retried
+            # on the next command instead of being served for a whole TTL.
+            _write_cached_catalog(fetched)
+            return providers
+
+    providers = _parse_providers(payload)
     if not providers:
         raise AuthenticationError("Model discovery returned no providers.")
     return providers
@@ -103,59 +308,55 @@ def load_model_catalog(auth_client: Optional[AuthClient] = None) -> List[Provide
 
 def get_ticker() -> str:
     """Prompt the user to enter a ticker symbol."""
+    import questionary
+
     ticker = questionary.text(
         "Enter the ticker symbol to analyze:",
         validate=lambda x: len(x.strip()) > 0 or "Please enter a valid ticker symbol.",
-        style=questionary.Style(
-            [
-                ("text", "fg:green"),
-                ("highlighted", "noinherit"),
-            ]
-        ),
+        style=_prompt_style("green"),
     ).ask()
 
     if not ticker:
-        console.print("\n[red]No ticker symbol provided. Exiting...[/red]")
-        exit(1)
+        _console().print("\n[red]No ticker symbol provided. Exiting...[/red]")
+        raise typer.Exit(code=1)
 
     return ticker.strip().upper()
 
 
+def _try_strptime(date_str: str) -> bool:
+    try:
+        datetime.datetime.strptime(date_str, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def _validate_date(date_str: str) -> bool:
+    return bool(_DATE_RE.match(date_str)) and _try_strptime(date_str)
+
+
 def get_analysis_date() -> str:
     """Prompt the user to enter a date in YYYY-MM-DD format."""
-    import re
-    from datetime import datetime
-
-    def validate_date(date_str: str) -> bool:
-        if not re.match(r"^\d{4}-\d{2}-\d{2}$", date_str):
-            return False
-        try:
-            datetime.strptime(date_str, "%Y-%m-%d")
-            return True
-        except ValueError:
-            return False
+    import questionary
 
     date = questionary.text(
         "Enter the analysis date (YYYY-MM-DD):",
-        validate=lambda x: validate_date(x.strip())
+        validate=lambda x: _validate_date(x.strip())
         or "Please enter a valid date in YYYY-MM-DD format.",
-        style=questionary.Style(
-            [
-                ("text", "fg:green"),
-                ("highlighted", "noinherit"),
-            ]
-        ),
+        style=_prompt_style("green"),
     ).ask()
 
     if not date:
-        console.print("\n[red]No date provided. Exiting...[/red]")
-        exit(1)
+        _console().print("\n[red]No date provided. Exiting...[/red]")
+        raise typer.Exit(code=1)
 
     return date.strip()
 
 
 def select_analysts() -> List[AnalystType]:
     """Select analysts using an interactive checkbox."""
+    import questionary
+
     choices = questionary.checkbox(
         "Select Your [Analysts Team]:",
         choices=[
@@ -163,25 +364,19 @@ def select_analysts() -> List[AnalystType]:
         ],
         instruction="\n- Press Space to select/unselect analysts\n- Press 'a' to select/unselect all\n- Press Enter when done",
         validate=lambda x: len(x) > 0 or "You must select at least one analyst.",
-        style=questionary.Style(
-            [
-                ("checkbox-selected", "fg:green"),
-                ("selected", "fg:green noinherit"),
-                ("highlighted", "noinherit"),
-                ("pointer", "noinherit"),
-            ]
-        ),
+        style=_prompt_style("checkbox"),
     ).ask()
 
     if not choices:
-        console.print("\n[red]No analysts selected. Exiting...[/red]")
-        exit(1)
+        _console().print("\n[red]No analysts selected. Exiting...[/red]")
+        raise typer.Exit(code=1)
 
     return choices
 
 
 def select_research_depth() -> int:
     """Select research depth using an interactive selection."""
+    import questionary
 
     # Define research depth options with their corresponding values
     DEPTH_OPTIONS = [
@@ -196,100 +391,92 @@ def select_research_depth() -> int:
             questionary.Choice(display, value=value) for display, value in DEPTH_OPTIONS
         ],
         instruction="\n- Use arrow keys to navigate\n- Press Enter to select",
-        style=questionary.Style(
-            [
-                ("selected", "fg:yellow noinherit"),
-                ("highlighted", "fg:yellow noinherit"),
-                ("pointer", "fg:yellow noinherit"),
-            ]
-        ),
+        style=_prompt_style("yellow"),
     ).ask()
 
     if choice is None:
-        console.print("\n[red]No research depth selected. Exiting...[/red]")
-        exit(1)
+        _console().print("\n[red]No research depth selected. Exiting...[/red]")
+        raise typer.Exit(code=1)
 
     return choice
 
 
 def _filter_models_by_capability(provider: ProviderInfo, capability: str) -> List[ModelInfo]:
-    filtered = [model for model in provider.models if capability in model.capabilities]
-    return filtered or provider.models
+    return provider.models_by_capability.get(sys.intern(capability)) or provider.models
+
+
+@functools.lru_cache(maxsize=8)
+def _build_model_choices(models: Tuple[ModelInfo, ...]) -> List[questionary.Choice]:
+    """Build (once per model tuple) the Choice list for a model prompt."""
+    import questionary
+
+    return [questionary.Choice(model.display_name, value=model.id) for model in models]
 
 
 def select_shallow_thinking_agent(provider: ProviderInfo) -> str:
     """Select shallow thinking llm engine using an interactive selection."""
+    import questionary
 
-    models = _filter_models_by_capability(provider, "quick")
     choice = questionary.select(
         "Select Your [Quick-Thinking LLM Engine]:",
-        choices=[
-            questionary.Choice(model.display_name, value=model.id) for model in models
-        ],
-        instruction="\n- Use arrow keys to navigate\n- Press Enter to select",
-        style=questionary.Style(
-            [
-                ("selected", "fg:magenta noinherit"),
-                ("highlighted", "fg:magenta noinherit"),
-                ("pointer", "fg:magenta noinherit"),
-            ]
+        choices=_build_model_choices(
+            tuple(_filter_models_by_capability(provider, "quick"))
         ),
+        instruction="\n- Use arrow keys to navigate\n- Press Enter to select",
+        style=_prompt_style("magenta"),
     ).ask()
 
     if choice is None:
-        console.print("\n[red]No shallow thinking llm engine selected. Exiting...[/red]")
-        exit(1)
+        _console().print("\n[red]No shallow thinking llm engine selected. Exiting...[/red]")
+        raise typer.Exit(code=1)
 
     return choice
 
 
 def select_deep_thinking_agent(provider: ProviderInfo) -> str:
     """Select deep thinking llm engine using an interactive selection."""
+    import questionary
 
-    models = _filter_models_by_capability(provider, "deep")
     choice = questionary.select(
         "Select Your [Deep-Thinking LLM Engine]:",
-        choices=[
-            questionary.Choice(model.display_name, value=model.id) for model in models
-        ],
-        instruction="\n- Use arrow keys to navigate\n- Press Enter to select",
-        style=questionary.Style(
-            [
-                ("selected", "fg:magenta noinherit"),
-                ("highlighted", "fg:magenta noinherit"),
-                ("pointer", "fg:magenta noinherit"),
-            ]
+        choices=_build_model_choices(
+            tuple(_filter_models_by_capability(provider, "deep"))
         ),
+        instruction="\n- Use arrow keys to navigate\n- Press Enter to select",
+        style=_prompt_style("magenta"),
     ).ask()
 
     if choice is None:
-        console.print("\n[red]No deep thinking llm engine selected. Exiting...[/red]")
-        exit(1)
+        _console().print("\n[red]No deep thinking llm engine selected. Exiting...[/red]")
+        raise typer.Exit(code=1)
 
     return choice
 
 
+@functools.lru_cache(maxsize=8)
+def _build_provider_choices(providers: Tuple[ProviderInfo, ...]) -> List[questionary.Choice]:
+    """Build (once per provider tuple) the Choice list for the provider prompt."""
+    import questionary
+
+    return [
+        questionary.Choice(provider.display_name, value=provider)
+        for provider in providers
+    ]
+
+
 def select_llm_provider(providers: List[ProviderInfo]) -> ProviderInfo:
     """Select the LLM provider using interactive selection from model discovery."""
+    import questionary
 
     choice = questionary.select(
         "Select your LLM Provider:",
-        choices=[
-            questionary.Choice(provider.display_name, value=provider)
-            for provider in providers
-        ],
+        choices=_build_provider_choices(tuple(providers)),
         instruction="\n- Use arrow keys to navigate\n- Press Enter to select",
-        style=questionary.Style(
-            [
-                ("selected", "fg:magenta noinherit"),
-                ("highlighted", "fg:magenta noinherit"),
-                ("pointer", "fg:magenta noinherit"),
-            ]
-        ),
+        style=_prompt_style("magenta"),
     ).ask()
 
     if choice is None:
-        console.print("\n[red]no LLM backend selected. Exiting...[/red]")
-        exit(1)
+        _console().print("\n[red]no LLM backend selected. Exiting...[/red]")
+        raise typer.Exit(code=1)
 
     return choice
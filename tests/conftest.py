@@ -1,17 +1,78 @@
+import importlib.abc
+import importlib.machinery
 import os
 import sys
-import types
+
+import pytest
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, PROJECT_ROOT)
 
-# Create lightweight package stubs to avoid importing heavy modules
-if 'tradingagents' not in sys.modules:
-    pkg = types.ModuleType('tradingagents')
-    pkg.__path__ = [os.path.join(PROJECT_ROOT, 'tradingagents')]
-    sys.modules['tradingagents'] = pkg
+# Lightweight package stubs to avoid importing heavy modules: the package
+# ``__init__`` files are skipped, but submodules still load from disk.
+_STUB_PACKAGES = {
+    'tradingagents': os.path.join(PROJECT_ROOT, 'tradingagents'),
+    'tradingagents.dataflows': os.path.join(PROJECT_ROOT, 'tradingagents', 'dataflows'),
+}
+
+
+class _LazyStubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Materialize the stub packages only when they are first imported."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        location = _STUB_PACKAGES.get(fullname)
+        if location is None:
+            return None
+        spec = importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+        spec.submodule_search_locations = [location]
+        return spec
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        pass
+
+
+if not any(isinstance(finder, _LazyStubFinder) for finder in sys.meta_path):
+    sys.meta_path.insert(0, _LazyStubFinder())
+
+
+class FakeSession:
+    """Stand-in for ``requests.Session`` replaying queued responses."""
+
+    def __init__(self):
+        self.posts = []
+        self.gets = []
+        self.calls = []
+
+    def reset(self):
+        self.posts.clear()
+        self.gets.clear()
+        self.calls.clear()
+
+    def post(self, url, data=None, timeout=None):
+        self.calls.append(("post", url, data))
+        if not self.posts:
+            raise AssertionError("Unexpected POST call")
+        responder = self.posts.pop(0)
+        return responder() if callable(responder) else responder
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append(("get", url, headers))
+        if not self.gets:
+            raise AssertionError("Unexpected GET call")
+        responder = self.gets.pop(0)
+        return responder() if callable(responder) else responder
+
+
+@pytest.fixture(scope="session")
+def _shared_fake_session():
+    return FakeSession()
+
 
-if 'tradingagents.dataflows' not in sys.modules:
-    subpkg = types.ModuleType('tradingagents.dataflows')
-    subpkg.__path__ = [os.path.join(PROJECT_ROOT, 'tradingagents', 'dataflows')]
-    sys.modules['tradingagents.dataflows'] = subpkg
+@pytest.fixture
+def fake_session(_shared_fake_session):
+    _shared_fake_session.reset()
+    yield _shared_fake_session
+    _shared_fake_session.reset()
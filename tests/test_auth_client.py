@@ -1,3 +1,6 @@
+import asyncio
+import json
+import threading
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -7,44 +10,31 @@ from tradingagents.auth.models import DeviceCodeGrant, TokenSet
 
 
 class FakeResponse:
-    def __init__(self, status_code=200, payload=None, text=""):
+    def __init__(self, status_code=200, payload=None, text="", headers=None):
         self.status_code = status_code
         self._payload = payload
         self.text = text or ""
+        self.headers = headers or {}
         self.ok = 200 <= status_code < 400
 
+    @property
+    def content(self):
+        if self._payload is None:
+            return self.text.encode("utf-8")
+        return json.dumps(self._payload).encode("utf-8")
+
     def json(self):
         if self._payload is None:
             raise ValueError("no json payload")
         return self._payload
 
 
-class FakeSession:
-    def __init__(self, *, posts=None, gets=None):
-        self.posts = posts or []
-        self.gets = gets or []
-        self.calls = []
-
-    def post(self, url, data=None, timeout=None):
-        self.calls.append(("post", url, data))
-        if not self.posts:
-            raise AssertionError("Unexpected POST call")
-        responder = self.posts.pop(0)
-        return responder() if callable(responder) else responder
-
-    def get(self, url, headers=None, timeout=None):
-        self.calls.append(("get", url, headers))
-        if not self.gets:
-            raise AssertionError("Unexpected GET call")
-        responder = self.gets.pop(0)
-        return responder() if callable(responder) else responder
-
-
 class MemoryTokenStore:
     def __init__(self, token: TokenSet | None = None):
         self.token = token
         self.saved = None
         self.cleared = False
+        self.pending_grant = None
 
     def save(self, token: TokenSet):
         self.saved = token
@@ -57,6 +47,15 @@ class MemoryTokenStore:
         self.cleared = True
         self.token = None
 
+    def save_pending_grant(self, grant: DeviceCodeGrant):
+        self.pending_grant = grant
+
+    def load_pending_grant(self):
+        return self.pending_grant
+
+    def clear_pending_grant(self):
+        self.pending_grant = None
+
 
 def make_grant(interval: int = 0) -> DeviceCodeGrant:
     return DeviceCodeGrant(
@@ -71,13 +70,13 @@ def make_grant(interval: int = 0) -> DeviceCodeGrant:
 
 def make_token(expired: bool = False) -> TokenSet:
     expires_at = datetime.now(tz=timezone.utc)
-    expires_at += timedelta(minutes=5) if not expired else timedelta(minutes=-5)
+    expires_at += timedelta(minutes=30) if not expired else timedelta(minutes=-5)
     return TokenSet(
         access_token="access", refresh_token="refresh", token_type="bearer", scope=None, expires_at=expires_at
     )
 
 
-def test_login_saves_tokens(monkeypatch):
+def test_login_saves_tokens(monkeypatch, fake_session):
     grant_payload = {
         "device_code": "device",
         "user_code": "user",
@@ -89,27 +88,27 @@ def test_login_saves_tokens(monkeypatch):
         "access_token": "new", "refresh_token": "ref", "token_type": "bearer", "expires_in": 3600
     }
 
-    session = FakeSession(posts=[FakeResponse(payload=grant_payload), FakeResponse(payload=token_payload)])
+    fake_session.posts.extend([FakeResponse(payload=grant_payload), FakeResponse(payload=token_payload)])
     store = MemoryTokenStore()
-    client = AuthClient(token_store=store, session=session)
+    client = AuthClient(token_store=store, session=fake_session)
 
     monkeypatch.setattr(client, "_open_browser", lambda grant: None)
     token = client.login(open_browser=False)
 
     assert token.access_token == "new"
     assert store.saved == token
-    assert session.calls[0][1].endswith("/device/code")
+    assert fake_session.calls[0][1].endswith("/device/code")
 
 
-def test_poll_waits_for_authorization(monkeypatch):
+def test_poll_waits_for_authorization(monkeypatch, fake_session):
     grant = make_grant(interval=0)
-    session = FakeSession(
-        posts=[
+    fake_session.posts.extend(
+        [
             FakeResponse(status_code=400, payload={"error": "authorization_pending"}),
             FakeResponse(payload={"access_token": "ok", "expires_in": 5}),
         ]
     )
-    client = AuthClient(session=session)
+    client = AuthClient(session=fake_session)
     monkeypatch.setattr(client, "token_store", MemoryTokenStore())
     monkeypatch.setattr("tradingagents.auth.auth_client.time.sleep", lambda *_: None)
 
@@ -117,12 +116,12 @@ def test_poll_waits_for_authorization(monkeypatch):
     assert token.access_token == "ok"
 
 
-def test_refreshes_expired_session(monkeypatch):
+def test_refreshes_expired_session(monkeypatch, fake_session):
     old_token = make_token(expired=True)
     new_token_payload = {"access_token": "fresh", "refresh_token": "r2", "expires_in": 10}
-    session = FakeSession(posts=[FakeResponse(payload=new_token_payload)])
+    fake_session.posts.append(FakeResponse(payload=new_token_payload))
     store = MemoryTokenStore(token=old_token)
-    client = AuthClient(token_store=store, session=session)
+    client = AuthClient(token_store=store, session=fake_session)
 
     refreshed = client.get_session()
 
@@ -130,37 +129,194 @@ def test_refreshes_expired_session(monkeypatch):
     assert store.saved.access_token == "fresh"
 
 
-def test_logout_revokes_and_clears(monkeypatch):
+def test_logout_revokes_and_clears(monkeypatch, fake_session):
     token = make_token()
-    session = FakeSession(posts=[FakeResponse(status_code=200)])
+    fake_session.posts.append(FakeResponse(status_code=200))
     store = MemoryTokenStore(token=token)
-    client = AuthClient(token_store=store, session=session)
+    client = AuthClient(token_store=store, session=fake_session)
 
     client.logout()
 
     assert store.cleared is True
-    assert session.calls[0][1].endswith("/revoke")
+    assert fake_session.calls[0][1].endswith("/revoke")
 
 
-def test_discover_models_uses_authorization_header():
+def test_discover_models_uses_authorization_header(fake_session):
     token = make_token()
     payload = {"providers": []}
-    session = FakeSession(gets=[FakeResponse(payload=payload)])
+    fake_session.gets.append(FakeResponse(payload=payload))
     store = MemoryTokenStore(token=token)
-    client = AuthClient(token_store=store, session=session)
+    client = AuthClient(token_store=store, session=fake_session)
 
     result = client.discover_models()
 
     assert result == payload
-    assert session.calls[0][2]["Authorization"] == token.as_authorization_header()
+    assert fake_session.calls[0][2]["Authorization"] == token.as_authorization_header()
 
 
-def test_poll_raises_on_expired_code(monkeypatch):
+def test_poll_raises_on_expired_code(monkeypatch, fake_session):
     grant = make_grant(interval=0)
     grant.expires_at = datetime.now(tz=timezone.utc) - timedelta(seconds=1)
-    session = FakeSession(posts=[])
-    client = AuthClient(session=session)
+    client = AuthClient(session=fake_session)
     monkeypatch.setattr("tradingagents.auth.auth_client.time.sleep", lambda *_: None)
 
     with pytest.raises(DeviceCodeError):
         client.poll_for_token(grant)
+
+
+def test_apoll_waits_without_blocking(monkeypatch, fake_session):
+    grant = make_grant(interval=0)
+    fake_session.posts.extend(
+        [
+            FakeResponse(status_code=400, payload={"error": "slow_down"}),
+            FakeResponse(payload={"access_token": "ok", "expires_in": 5}),
+        ]
+    )
+    client = AuthClient(session=fake_session, token_store=MemoryTokenStore())
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("tradingagents.auth.auth_client.asyncio.sleep", fake_sleep)
+
+    token = asyncio.run(client.apoll_for_token(grant))
+
+    assert token.access_token == "ok"
+    assert len(sleeps) == 1 and 5 <= sleeps[0] <= 6
+
+
+def test_get_session_reuses_recent_session(fake_session):
+    class CountingTokenStore(MemoryTokenStore):
+        loads = 0
+
+        def load(self):
+            CountingTokenStore.loads += 1
+            return super().load()
+
+    token = make_token()
+    client = AuthClient(token_store=CountingTokenStore(token=token), session=fake_session)
+
+    assert client.get_session() is token
+    assert client.get_session() is token
+    assert CountingTokenStore.loads == 1
+
+    fake_session.posts.append(FakeResponse(status_code=200))
+    client.logout()
+    assert client._cached_session() is None
+
+
+def test_get_session_refreshes_ahead_of_expiry(fake_session):
+    token = make_token()
+    token.expires_at = datetime.now(tz=timezone.utc) + timedelta(minutes=2)
+    fake_session.posts.append(
+        FakeResponse(payload={"access_token": "fresh", "refresh_token": "r2", "expires_in": 3600})
+    )
+    store = MemoryTokenStore(token=token)
+    client = AuthClient(token_store=store, session=fake_session)
+
+    assert client.get_session() is token
+    client._refresh_future.result(timeout=5)
+
+    assert store.saved.access_token == "fresh"
+    assert client.get_session().access_token == "fresh"
+
+
+def test_logout_discards_in_flight_background_refresh(fake_session):
+    token = make_token()
+    token.expires_at = datetime.now(tz=timezone.utc) + timedelta(minutes=2)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_refresh():
+        started.set()
+        release.wait(timeout=5)
+        return FakeResponse(payload={"access_token": "resurrected", "expires_in": 3600})
+
+    fake_session.posts.extend([slow_refresh, FakeResponse(status_code=200)])
+    store = MemoryTokenStore(token=token)
+    client = AuthClient(token_store=store, session=fake_session)
+
+    client.get_session()
+    refresh_future = client._refresh_future
+    assert started.wait(timeout=5)
+    client.logout()
+    release.set()
+    refresh_future.result(timeout=5)
+
+    assert store.token is None
+    assert client._cached_session() is None
+
+
+def test_login_discards_background_refresh_of_previous_session(fake_session):
+    token = make_token()
+    token.expires_at = datetime.now(tz=timezone.utc) + timedelta(minutes=2)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_refresh():
+        started.set()
+        release.wait(timeout=5)
+        return FakeResponse(payload={"access_token": "old-lineage", "expires_in": 3600})
+
+    fake_session.posts.extend(
+        [slow_refresh, FakeResponse(payload={"access_token": "relogged", "expires_in": 3600})]
+    )
+    store = MemoryTokenStore(token=token)
+    store.pending_grant = make_grant(interval=0)
+    client = AuthClient(token_store=store, session=fake_session)
+
+    client.get_session()
+    refresh_future = client._refresh_future
+    assert started.wait(timeout=5)
+    client.login(open_browser=False)
+    release.set()
+    refresh_future.result(timeout=5)
+
+    assert store.token.access_token == "relogged"
+    assert client.get_session().access_token == "relogged"
+
+
+def test_background_refresh_does_not_block_interpreter_exit(fake_session):
+    token = make_token()
+    token.expires_at = datetime.now(tz=timezone.utc) + timedelta(minutes=2)
+    release = threading.Event()
+
+    def slow_refresh():
+        release.wait(timeout=5)
+        return FakeResponse(payload={"access_token": "fresh", "expires_in": 3600})
+
+    fake_session.posts.append(slow_refresh)
+    client = AuthClient(token_store=MemoryTokenStore(token=token), session=fake_session)
+
+    client.get_session()
+    workers = [t for t in threading.enumerate() if t.name == "tradingagents-auth-refresh"]
+    release.set()
+    client._refresh_future.result(timeout=5)
+
+    assert workers and all(worker.daemon for worker in workers)
+
+
+def test_slow_down_honours_retry_after_and_caps_interval(fake_session):
+    grant = make_grant(interval=5)
+    fake_session.posts.extend(
+        [
+            FakeResponse(status_code=400, payload={"error": "slow_down"}, headers={"Retry-After": "20"}),
+            FakeResponse(status_code=400, payload={"error": "slow_down", "interval": 300}),
+        ]
+    )
+    client = AuthClient(session=fake_session, token_store=MemoryTokenStore())
+
+    assert client._poll_step(grant, grant.interval) == (None, 20)
+    assert client._poll_step(grant, 20) == (None, 60)
+
+
+def test_login_resumes_pending_grant(fake_session):
+    fake_session.posts.append(FakeResponse(payload={"access_token": "resumed", "expires_in": 3600}))
+    store = MemoryTokenStore()
+    store.pending_grant = make_grant(interval=0)
+    client = AuthClient(token_store=store, session=fake_session)
+
+    token = client.login(open_browser=False)
+
+    assert token.access_token == "resumed"
+    assert [call[1] for call in fake_session.calls] == [client.endpoints.token]
+    assert store.pending_grant is None
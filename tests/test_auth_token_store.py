@@ -1,8 +1,10 @@
 import json
+import os
+import stat
 from datetime import datetime, timedelta, timezone
 
 from tradingagents.auth import token_store
-from tradingagents.auth.models import TokenSet
+from tradingagents.auth.models import DeviceCodeGrant, TokenSet
 from tradingagents.auth.token_store import TokenStore
 
 
@@ -68,6 +70,17 @@ def test_prefers_keyring_when_available(tmp_path, monkeypatch):
     assert loaded == token
 
 
+def test_keyring_reads_are_cached_until_forced(tmp_path, monkeypatch):
+    dummy = DummyKeyring()
+    monkeypatch.setattr(token_store, "keyring", dummy)
+    store = TokenStore(file_path=tmp_path / "tokens.json", service_name="svc")
+    store.save(_sample_token())
+
+    dummy.storage.clear()
+    assert store.load() is not None
+    assert store.load(force_reload=True) is None
+
+
 def test_clear_removes_keyring_and_file(tmp_path, monkeypatch):
     dummy = DummyKeyring()
     monkeypatch.setattr(token_store, "keyring", dummy)
@@ -81,3 +94,40 @@ def test_clear_removes_keyring_and_file(tmp_path, monkeypatch):
 
     assert dummy.storage == {}
     assert not store.file_path.exists()
+
+
+def test_pending_grant_round_trip(tmp_path):
+    store = TokenStore(file_path=tmp_path / "tokens.json")
+    grant = DeviceCodeGrant(
+        device_code="device",
+        user_code="user",
+        verification_uri="https://verify",
+        verification_uri_complete=None,
+        expires_at=datetime.now(tz=timezone.utc) + timedelta(minutes=5),
+        interval=5,
+    )
+
+    assert store.load_pending_grant() is None
+    store.save_pending_grant(grant)
+    assert store.load_pending_grant() == grant
+
+    store.clear_pending_grant()
+    assert store.load_pending_grant() is None
+
+
+def test_file_writes_are_private_before_rename(tmp_path, monkeypatch):
+    monkeypatch.setattr(token_store, "keyring", None)
+    store = TokenStore(file_path=tmp_path / "tokens.json")
+    modes = []
+    real_replace = os.replace
+
+    def recording_replace(src, dst):
+        modes.append(stat.S_IMODE(os.stat(src).st_mode))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(token_store.os, "replace", recording_replace)
+    store.save(_sample_token())
+
+    assert modes == [0o600]
+    assert stat.S_IMODE(os.stat(store.file_path).st_mode) == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == ["tokens.json"]
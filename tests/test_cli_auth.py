@@ -1,3 +1,4 @@
+import pytest
 from typer.testing import CliRunner
 
 from cli import main as cli_main
@@ -20,34 +21,32 @@ class RecordingAuthClient:
         return "token"
 
 
-def test_cli_login(monkeypatch):
+@pytest.fixture
+def recording_auth_client(monkeypatch):
     RecordingAuthClient.last_action = None
     monkeypatch.setattr(cli_main, "AuthClient", RecordingAuthClient)
+    return RecordingAuthClient
 
+
+def test_cli_login(recording_auth_client):
     runner = CliRunner()
     result = runner.invoke(cli_main.app, ["login", "--no-open-browser"], prog_name="tradingagents")
 
     assert result.exit_code == 0
     assert "Authentification réussie" in result.output
-    assert RecordingAuthClient.last_action == "login"
-
+    assert recording_auth_client.last_action == "login"
 
-def test_cli_logout(monkeypatch):
-    RecordingAuthClient.last_action = None
-    monkeypatch.setattr(cli_main, "AuthClient", RecordingAuthClient)
 
+def test_cli_logout(recording_auth_client):
     runner = CliRunner()
     result = runner.invoke(cli_main.app, ["logout"], prog_name="tradingagents")
 
     assert result.exit_code == 0
     assert "Déconnexion réussie" in result.output
-    assert RecordingAuthClient.last_action == "logout"
+    assert recording_auth_client.last_action == "logout"
 
 
-def test_models_list(monkeypatch):
-    RecordingAuthClient.last_action = None
-    monkeypatch.setattr(cli_main, "AuthClient", RecordingAuthClient)
-
+def test_models_list(monkeypatch, recording_auth_client):
     providers = [
         ProviderInfo(
             id="openai",
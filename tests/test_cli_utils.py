@@ -0,0 +1,134 @@
+import os
+import time
+
+import pytest
+import requests
+
+from cli import utils as cli_utils
+from tradingagents.auth import AuthenticationError
+
+
+CATALOG = {
+    "providers": [
+        {"id": "openai", "display_name": "OpenAI", "models": ["gpt-4o-mini"]},
+    ]
+}
+
+
+class CatalogClient:
+    def __init__(self, payload=None, error=None):
+        self.payload = payload
+        self.error = error
+        self.calls = 0
+
+    def discover_models(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.payload
+
+
+@pytest.fixture
+def models_cache(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "models.json"
+    monkeypatch.setattr(cli_utils, "_MODELS_CACHE_PATH", path)
+    monkeypatch.delenv("TRADINGAGENTS_DISABLE_REMOTE_MODELS", raising=False)
+    return path
+
+
+def test_catalog_is_served_from_fresh_cache(models_cache):
+    client = CatalogClient(payload=CATALOG)
+
+    first = cli_utils.load_model_catalog(client)
+    second = cli_utils.load_model_catalog(client)
+
+    assert client.calls == 1
+    assert models_cache.exists()
+    assert [p.id for p in first] == [p.id for p in second] == ["openai"]
+
+
+def test_stale_cache_is_refreshed(models_cache):
+    cli_utils.load_model_catalog(CatalogClient(payload=CATALOG))
+    stale = time.time() - cli_utils._MODELS_CACHE_TTL - 1
+    os.utime(cli_utils._models_sync_marker(), (stale, stale))
+
+    client = CatalogClient(payload=CATALOG)
+    cli_utils.load_model_catalog(client)
+
+    assert client.calls == 1
+
+
+def test_stale_cache_used_when_discovery_fails(models_cache):
+    cli_utils.load_model_catalog(CatalogClient(payload=CATALOG))
+    cli_utils._models_sync_marker().unlink()
+
+    client = CatalogClient(error=requests.ConnectionError("offline"))
+    providers = cli_utils.load_model_catalog(client)
+
+    assert client.calls == 1
+    assert providers[0].models[0].id == "gpt-4o-mini"
+
+
+def test_authentication_error_is_not_masked_by_stale_cache(models_cache):
+    cli_utils.load_model_catalog(CatalogClient(payload=CATALOG))
+    cli_utils._models_sync_marker().unlink()
+
+    with pytest.raises(AuthenticationError):
+        cli_utils.load_model_catalog(CatalogClient(error=AuthenticationError("revoked")))
+
+
+def test_empty_discovery_reply_is_not_cached(models_cache):
+    with pytest.raises(AuthenticationError):
+        cli_utils.load_model_catalog(CatalogClient(payload={"providers": []}))
+
+    assert not models_cache.exists()
+    client = CatalogClient(payload=CATALOG)
+    assert [p.id for p in cli_utils.load_model_catalog(client)] == ["openai"]
+    assert client.calls == 1
+
+
+def test_discovery_error_without_cache_is_raised(models_cache):
+    with pytest.raises(AuthenticationError):
+        cli_utils.load_model_catalog(CatalogClient(error=AuthenticationError("offline")))
+
+
+def test_disable_remote_models_uses_cache_only(models_cache, monkeypatch):
+    monkeypatch.setenv("TRADINGAGENTS_DISABLE_REMOTE_MODELS", "1")
+    client = CatalogClient(payload=CATALOG)
+
+    with pytest.raises(AuthenticationError):
+        cli_utils.load_model_catalog(client)
+    assert client.calls == 0
+
+
+def test_parse_providers_reuses_parsed_catalog():
+    first = cli_utils._parse_providers(CATALOG)
+    second = cli_utils._parse_providers({"providers": list(CATALOG["providers"])})
+
+    assert first is not second
+    assert first[0] is second[0]
+
+
+def test_model_choices_are_shared_between_prompts():
+    model = cli_utils.ModelInfo(id="gpt", display_name="GPT", capabilities=frozenset({"quick"}))
+    provider = cli_utils.ProviderInfo(
+        id="openai", display_name="OpenAI", base_url=None, models=[model]
+    )
+
+    quick = cli_utils._build_model_choices(
+        tuple(cli_utils._filter_models_by_capability(provider, "quick"))
+    )
+    deep = cli_utils._build_model_choices(
+        tuple(cli_utils._filter_models_by_capability(provider, "deep"))
+    )
+
+    assert quick is deep
+    assert [choice.value for choice in quick] == ["gpt"]
+
+
+def test_model_info_freezes_capabilities_for_choice_cache():
+    model = cli_utils.ModelInfo(id="gpt", display_name="GPT", capabilities={"quick"})
+
+    assert model.capabilities == frozenset({"quick"})
+    choices = cli_utils._build_model_choices((model,))
+    assert [choice.value for choice in choices] == ["gpt"]
@@ -0,0 +1,62 @@
+import pytest
+
+from tradingagents.dataflows import fmp_utils
+from tradingagents.dataflows.fmp_utils_async import get_data_in_ranges_sync
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def fmp_requests(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append((url, dict(params)))
+        return FakeResponse([{"title": "headline"}])
+
+    monkeypatch.setattr(fmp_utils._SESSION, "get", fake_get)
+    fmp_utils.clear_fmp_cache()
+    yield calls
+    fmp_utils.clear_fmp_cache()
+
+
+def test_identical_queries_share_one_request(fmp_requests):
+    first = fmp_utils.get_data_in_range("AAPL", "2024-01-01", "2024-01-31", "news_data", "")
+    first["2024-01-01"].append({"title": "mutated"})
+    second = fmp_utils.get_data_in_range("AAPL", "2024-01-01", "2024-01-31", "news_data", "")
+
+    assert len(fmp_requests) == 1
+    assert second == {"2024-01-01": [{"title": "headline"}]}
+
+
+def test_cached_responses_expire(fmp_requests, monkeypatch):
+    fmp_utils.get_data_in_range("AAPL", "2024-01-01", "2024-01-31", "SEC_filings", "")
+    clock = fmp_utils._clock() + fmp_utils._RESPONSE_CACHE_TTL + 1
+    monkeypatch.setattr(fmp_utils, "_clock", lambda: clock)
+    fmp_utils.get_data_in_range("AAPL", "2024-01-01", "2024-01-31", "SEC_filings", "")
+
+    assert len(fmp_requests) == 2
+
+
+def test_data_in_ranges_fetches_each_type(fmp_requests):
+    result = get_data_in_ranges_sync(
+        "AAPL", "2024-01-01", "2024-01-31", ["news_data", "SEC_filings", "unknown"], ""
+    )
+
+    assert len(fmp_requests) == 2
+    assert result == {
+        "2024-01-01": {
+            "news_data": [{"title": "headline"}],
+            "SEC_filings": [{"title": "headline"}],
+            "unknown": {},
+        }
+    }
@@ -1,8 +1,15 @@
 from datetime import datetime
+
+import pytest
+
 from tradingagents.portfolio import (
     Portfolio,
     portfolio_performance,
     PortfolioOptimizer,
+    PriceEndpoints,
+    Transaction,
+    get_adjustment,
+    precompute_endpoints,
 )
 
 
@@ -29,6 +36,14 @@ def test_portfolio_performance():
     assert risk == 0.0
 
 
+def test_performance_values_empty_history_at_average_price():
+    p = Portfolio(cash=0)
+    p.deposit(1000, datetime(2024, 1, 1))
+    p.buy("AAPL", 10, 100, datetime(2024, 1, 2))
+
+    assert portfolio_performance(p, {"AAPL": []}) == portfolio_performance(p, {})
+
+
 def test_portfolio_optimizer():
     p = Portfolio(cash=1000)
     p.buy("AAPL", 10, 10, datetime(2024, 1, 1))
@@ -55,3 +70,107 @@ def test_update_portfolio_signal():
     assert p.positions["AAPL"].quantity == 1
     update("SELL")
     assert "AAPL" not in p.positions
+
+
+def test_positions_grow_and_close_in_order():
+    p = Portfolio(cash=10_000)
+    symbols = [f"S{i}" for i in range(20)]
+    for sym in symbols:
+        p.buy(sym, 2, 10, datetime(2024, 1, 1))
+    p.sell("S3", 2, 11, datetime(2024, 1, 2))
+
+    assert list(p.positions) == [s for s in symbols if s != "S3"]
+    assert "S3" not in p.positions
+    assert p.positions["S19"].quantity == 2
+    assert p.total_value({}) == p.cash + 19 * 2 * 10
+
+
+def test_history_records_transactions_in_order():
+    p = Portfolio(cash=0)
+    p.deposit(100, datetime(2024, 1, 1))
+    p.buy("AAPL", 2, 10, datetime(2024, 1, 2))
+    p.sell("AAPL", 1, 12, datetime(2024, 1, 3))
+
+    assert len(p.history) == 3
+    assert [t.type for t in p.history] == ["DEPOSIT", "BUY", "SELL"]
+    assert p.history[-1] == Transaction(datetime(2024, 1, 3), "AAPL", -1, 12, "SELL")
+    assert list(p.journal.as_transactions()) == list(p.history)
+    assert p.journal.notional().tolist() == [0.0, 20.0, -12.0]
+
+
+def test_total_value_tracks_price_changes_and_trades():
+    p = Portfolio(cash=1000)
+    p.buy("AAPL", 2, 10, datetime(2024, 1, 1))
+    p.buy("MSFT", 1, 20, datetime(2024, 1, 1))
+
+    assert p.total_value({"AAPL": 10, "MSFT": 20}) == 1000
+    assert p.total_value({"AAPL": 15, "MSFT": 20}) == 1010
+    assert p.total_value({"AAPL": 15}) == p.cash + 2 * 15 + 20
+
+    p.sell("AAPL", 1, 15, datetime(2024, 1, 2))
+    assert p.total_value({"AAPL": 12, "MSFT": 25}) == p.cash + 12 + 25
+
+
+def test_portfolio_optimizer_allocates_long_only_within_holdings():
+    p = Portfolio(cash=1000)
+    p.buy("AAPL", 10, 10, datetime(2024, 1, 1))
+    p.buy("MSFT", 5, 20, datetime(2024, 1, 1))
+    histories = {
+        "AAPL": [10, 10.5, 10.2, 10.8, 11.0],
+        "MSFT": [20, 19.5, 19.8, 19.0, 18.5],
+    }
+    opt = PortfolioOptimizer(max_risk=1.0)
+    adj, _ = opt.optimize(p, histories)
+
+    targets = {sym: p.positions[sym].quantity + adj[sym] for sym in adj}
+    assert all(qty >= -1e-9 for qty in targets.values())
+    invested = sum(p.positions[s].quantity * histories[s][-1] for s in histories)
+    target_value = sum(targets[s] * histories[s][-1] for s in histories)
+    assert abs(target_value - invested) < 1e-6
+    assert adj["AAPL"] > 0 > adj["MSFT"]
+
+
+def test_performance_accepts_precomputed_endpoints():
+    p = Portfolio(cash=1500)
+    p.buy("AAPL", 10, 100, datetime(2024, 1, 2))
+    p.buy("MSFT", 2, 50, datetime(2024, 1, 2))
+    histories = {"AAPL": [100, 105, 110], "MSFT": [50, 45]}
+
+    endpoints = precompute_endpoints(histories)
+
+    assert endpoints["AAPL"] == PriceEndpoints(100, 110, 3)
+    assert portfolio_performance(p, endpoints) == portfolio_performance(p, histories)
+
+
+def test_portfolio_optimizer_returns_empty_mapping_when_healthy():
+    p = Portfolio(cash=1000)
+    p.buy("AAPL", 10, 10, datetime(2024, 1, 1))
+    opt = PortfolioOptimizer(target_return=0.01, max_risk=0.5)
+    adj, (ret, _) = opt.optimize(p, {"AAPL": [10, 12]})
+
+    assert ret > opt.target_return
+    assert len(adj) == 0
+    assert get_adjustment(adj, "AAPL") == 0.0
+
+
+def test_position_snapshots_reject_writes():
+    p = Portfolio(cash=100)
+    p.buy("AAPL", 2, 10, datetime(2024, 1, 1))
+
+    with pytest.raises(AttributeError):
+        p.positions["AAPL"].quantity = 99
+    assert p.positions["AAPL"].quantity == 2
+
+
+def test_portfolio_equality_and_repr_reflect_positions():
+    a = Portfolio(cash=100)
+    b = Portfolio(cash=100)
+    a.buy("AAPL", 1, 10, datetime(2024, 1, 1))
+    b.buy("MSFT", 1, 10, datetime(2024, 1, 1))
+
+    assert a != b
+    assert "AAPL" in repr(a) and "MSFT" not in repr(a)
+
+    c = Portfolio(cash=100)
+    c.buy("AAPL", 1, 10, datetime(2024, 1, 1))
+    assert a == c
@@ -0,0 +1,20 @@
+from tradingagents.auth import session_cache
+
+
+def test_session_config_is_memoized_until_saved(tmp_path, monkeypatch):
+    path = tmp_path / "session_config.json"
+    monkeypatch.setattr(session_cache, "_CACHE_PATH", path)
+    session_cache.invalidate_session_config_cache()
+
+    assert session_cache.load_session_config() == {}
+
+    path.write_text('{"llm_provider": "anthropic"}', encoding="utf-8")
+    assert session_cache.load_session_config() == {}
+
+    session_cache.save_session_config({"llm_provider": "openai"})
+    loaded = session_cache.load_session_config()
+    assert loaded == {"llm_provider": "openai"}
+
+    loaded["llm_provider"] = "mutated"
+    assert session_cache.load_session_config() == {"llm_provider": "openai"}
+    session_cache.invalidate_session_config_cache()
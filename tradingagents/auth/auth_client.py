@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import os
+import random
+import threading
 import time
 import webbrowser
+from concurrent.futures import Future
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson is optional
+    orjson = None
 
 from .exceptions import (
     AuthenticationError,
@@ -22,6 +34,39 @@ from .token_store import TokenStore
 DEFAULT_AUTH_BASE_URL = os.environ.get("TRADINGAGENTS_AUTH_BASE_URL", "https://api.openai.com/v1/auth")
 DEFAULT_CLIENT_ID = os.environ.get("TRADINGAGENTS_CLIENT_ID", "tradingagents-cli")
 DEFAULT_SCOPE = os.environ.get("TRADINGAGENTS_SCOPE", "openid profile offline_access")
+SESSION_CACHE_TTL = float(os.environ.get("TRADINGAGENTS_SESSION_CACHE_TTL", "1.0"))
+# A cached session is only served while it stays valid for at least this long.
+_SESSION_CACHE_MIN_VALIDITY = 60
+# Upper bound (seconds) for the device-flow poll interval after slow_down responses.
+MAX_POLL_INTERVAL = 60
+# Tokens expiring within this window are refreshed in the background.
+REFRESH_AHEAD_SECONDS = 300
+
+
+def _int_or_zero(value) -> int:
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _retry_after_seconds(response: requests.Response) -> int:
+    headers = getattr(response, "headers", None) or {}
+    return _int_or_zero(headers.get("Retry-After"))
+
+
+def _jittered(interval: float) -> float:
+    """Spread concurrent pollers so they do not hit the server in lockstep."""
+
+    return interval + random.uniform(0, 1) if interval > 0 else interval
+
+
+def _response_json(response: requests.Response):
+    """Decode a JSON response body, preferring orjson when it is installed."""
+
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
 
 
 @dataclass
@@ -47,99 +92,265 @@ class AuthClient:
         self.base_url = base_url.rstrip("/")
         self.scope = scope
         self.token_store = token_store or TokenStore()
-        self.session = session or requests.Session()
+        self.session = session or self._build_session()
         self.endpoints = _AuthEndpoints(
             device_code=f"{self.base_url}/device/code",
             token=f"{self.base_url}/token",
             revoke=f"{self.base_url}/revoke",
-            
         )
+        # Static parts of the form bodies; each request only adds its own field.
+        self._device_code_payload = {"client_id": self.client_id, "scope": self.scope}
+        self._poll_base_payload = {
+            "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
+            "client_id": self.client_id,
+        }
+        self._refresh_base_payload = {"grant_type": "refresh_token", "client_id": self.client_id}
+        self._revoke_base_payload = {"client_id": self.client_id}
+        self._session_cache: Optional[Tuple[TokenSet, float]] = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_future: Optional[Future] = None
+        # Bumped by login() and logout(); a background refresh started under
+        # an older generation must not overwrite or revive the session.
+        self._session_generation = 0
+
+    @staticmethod
+    def _build_session() -> requests.Session:
+        # Keep connections alive so discovery, polling and refresh calls made
+        # by the same client reuse one TLS connection. urllib3 only retries
+        # idempotent methods by default, so token POSTs are never replayed.
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def start_device_code(self) -> DeviceCodeGrant:
-        payload = {"client_id": self.client_id, "scope": self.scope}
-        response = self.session.post(self.endpoints.device_code, data=payload, timeout=10)
+        response = self.session.post(
+            self.endpoints.device_code, data=self._device_code_payload, timeout=10
+        )
         if not response.ok:
             raise DeviceCodeError(f"Device-code initiation failed: {response.text}")
-        return DeviceCodeGrant.from_response(response.json())
+        return DeviceCodeGrant.from_response(_response_json(response))
+
+    def _poll_step(self, grant: DeviceCodeGrant, interval: int) -> Tuple[Optional[TokenSet], int]:
+        """Poll the token endpoint once.
+
+        Returns the issued token set, or ``None`` together with the interval to
+        wait before the next poll. Terminal errors are raised.
+        """
+
+        token_response = self.session.post(
+            self.endpoints.token,
+            data={**self._poll_base_payload, "device_code": grant.device_code},
+            timeout=10,
+        )
+        # Decode the body once and dispatch on it for both success and errors.
+        try:
+            payload = _response_json(token_response)
+        except ValueError:
+            payload = None
+        if token_response.ok and payload is not None:
+            return TokenSet.from_response(payload), interval
+
+        if isinstance(payload, dict):
+            error = payload.get("error")
+        else:
+            payload = {}
+            error = token_response.text
+
+        if error == "authorization_pending":
+            return None, interval
+        if error == "slow_down":
+            # RFC 8628 asks for +5s; also honour a longer server-provided delay.
+            interval = max(
+                interval + 5,
+                _retry_after_seconds(token_response),
+                _int_or_zero(payload.get("interval")),
+            )
+            return None, min(interval, MAX_POLL_INTERVAL)
+        if error == "expired_token":
+            raise DeviceCodeError("The device code has expired before authorization was completed.")
+
+        raise AuthenticationError(f"Authentication failed: {error}")
 
     def poll_for_token(self, grant: DeviceCodeGrant) -> TokenSet:
         interval = grant.interval
         while not grant.is_expired():
-            token_response = self.session.post(
-                self.endpoints.token,
-                data={
-                    "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
-                    "device_code": grant.device_code,
-                    "client_id": self.client_id,
-                },
-                timeout=10,
-            )
-            if token_response.ok:
-                return TokenSet.from_response(token_response.json())
+            token_set, interval = self._poll_step(grant, interval)
+            if token_set is not None:
+                return token_set
+            time.sleep(_jittered(interval))
 
-            try:
-                error = token_response.json().get("error")
-            except ValueError:
-                error = token_response.text
+        raise DeviceCodeError("Device code expired before polling completed.")
 
-            if error == "authorization_pending":
-                time.sleep(interval)
-                continue
-            if error == "slow_down":
-                interval += 5
-                time.sleep(interval)
-                continue
-            if error == "expired_token":
-                raise DeviceCodeError("The device code has expired before authorization was completed.")
+    async def apoll_for_token(self, grant: DeviceCodeGrant) -> TokenSet:
+        """Async variant of :meth:`poll_for_token` that yields while waiting."""
 
-            raise AuthenticationError(f"Authentication failed: {error}")
+        interval = grant.interval
+        while not grant.is_expired():
+            token_set, interval = await asyncio.to_thread(self._poll_step, grant, interval)
+            if token_set is not None:
+                return token_set
+            await asyncio.sleep(_jittered(interval))
 
         raise DeviceCodeError("Device code expired before polling completed.")
 
     def refresh(self, refresh_token: str) -> TokenSet:
         response = self.session.post(
             self.endpoints.token,
-            data={
-                "grant_type": "refresh_token",
-                "refresh_token": refresh_token,
-                "client_id": self.client_id,
-            },
+            data={**self._refresh_base_payload, "refresh_token": refresh_token},
             timeout=10,
         )
         if not response.ok:
             raise TokenRefreshError(f"Failed to refresh token: {response.text}")
-        return TokenSet.from_response(response.json())
+        return TokenSet.from_response(_response_json(response))
 
     def revoke(self, token: str) -> None:
         response = self.session.post(
             self.endpoints.revoke,
-            data={"token": token, "client_id": self.client_id},
+            data={**self._revoke_base_payload, "token": token},
             timeout=10,
         )
         if response.status_code not in (200, 204):
             raise TokenRevocationError(f"Failed to revoke token: {response.text}")
 
+    async def astart_device_code(self) -> DeviceCodeGrant:
+        return await asyncio.to_thread(self.start_device_code)
+
+    async def arefresh(self, refresh_token: str) -> TokenSet:
+        return await asyncio.to_thread(self.refresh, refresh_token)
+
+    async def arevoke(self, token: str) -> None:
+        await asyncio.to_thread(self.revoke, token)
+
     def _open_browser(self, grant: DeviceCodeGrant) -> None:
         url = grant.verification_uri_complete or grant.verification_uri
         webbrowser.open(url, new=1, autoraise=True)
 
+    def _resume_or_start_device_code(self) -> DeviceCodeGrant:
+        """Reuse a still-valid grant from an interrupted login, else start one."""
+
+        grant = self.token_store.load_pending_grant()
+        if grant is None or grant.is_expired():
+            grant = self.start_device_code()
+            self.token_store.save_pending_grant(grant)
+        return grant
+
     def login(self, *, open_browser: bool = True) -> TokenSet:
-        grant = self.start_device_code()
+        grant = self._resume_or_start_device_code()
         if open_browser:
             self._open_browser(grant)
-        token_set = self.poll_for_token(grant)
+        try:
+            token_set = self.poll_for_token(grant)
+        except AuthenticationError:
+            self.token_store.clear_pending_grant()
+            raise
+        self.token_store.clear_pending_grant()
+        self._new_session_generation()
         self.token_store.save(token_set)
+        self._cache_session(token_set)
+        return token_set
+
+    async def alogin(self, *, open_browser: bool = True) -> TokenSet:
+        """Async variant of :meth:`login`; the polling wait does not block the loop."""
+
+        grant = await asyncio.to_thread(self._resume_or_start_device_code)
+        if open_browser:
+            self._open_browser(grant)
+        try:
+            token_set = await self.apoll_for_token(grant)
+        except AuthenticationError:
+            self.token_store.clear_pending_grant()
+            raise
+        self.token_store.clear_pending_grant()
+        self._new_session_generation()
+        await asyncio.to_thread(self.token_store.save, token_set)
+        self._cache_session(token_set)
         return token_set
 
+    def _new_session_generation(self) -> None:
+        with self._refresh_lock:
+            self._session_generation += 1
+            if self._refresh_future is not None:
+                self._refresh_future.cancel()
+                self._refresh_future = None
+
+    def _cache_session(self, token_set: Optional[TokenSet]) -> None:
+        self._session_cache = (token_set, time.monotonic()) if token_set else None
+
+    def _cached_session(self) -> Optional[TokenSet]:
+        if self._session_cache is None:
+            return None
+        token_set, cached_at = self._session_cache
+        if time.monotonic() - cached_at >= SESSION_CACHE_TTL:
+            return None
+        if token_set.is_expired(skew_seconds=_SESSION_CACHE_MIN_VALIDITY):
+            return None
+        return token_set
+
+    def _refresh_ahead(self, token_set: TokenSet) -> None:
+        """Start a background refresh if ``token_set`` is about to expire."""
+
+        if not token_set.refresh_token or not token_set.is_expired(skew_seconds=REFRESH_AHEAD_SECONDS):
+            return
+        with self._refresh_lock:
+            if self._refresh_future is not None and not self._refresh_future.done():
+                return
+            future: Future = Future()
+            # A daemon thread, so interpreter exit never waits on a refresh
+            # nobody needs any more (get_session refreshes synchronously).
+            threading.Thread(
+                target=self._run_background_refresh,
+                args=(future, token_set.refresh_token, self._session_generation),
+                name="tradingagents-auth-refresh",
+                daemon=True,
+            ).start()
+            self._refresh_future = future
+
+    def _run_background_refresh(self, future: Future, refresh_token: str, generation: int) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            self._refresh_in_background(refresh_token, generation)
+        finally:
+            future.set_result(None)
+
+    def _refresh_in_background(self, refresh_token: str, generation: int) -> None:
+        try:
+            refreshed = self.refresh(refresh_token)
+        except Exception:
+            # Best-effort: get_session refreshes synchronously once the token expires.
+            return
+        with self._refresh_lock:
+            if generation != self._session_generation:
+                return
+            try:
+                self.token_store.save(refreshed)
+            except Exception:
+                return
+            self._cache_session(refreshed)
+
     def get_session(self) -> TokenSet:
+        cached = self._cached_session()
+        if cached is not None:
+            self._refresh_ahead(cached)
+            return cached
+
         token_set = self.token_store.load()
         if token_set and not token_set.is_expired():
+            self._cache_session(token_set)
+            self._refresh_ahead(token_set)
             return token_set
 
         if token_set and token_set.refresh_token:
             try:
                 refreshed = self.refresh(token_set.refresh_token)
                 self.token_store.save(refreshed)
+                self._cache_session(refreshed)
                 return refreshed
             except TokenRefreshError:
                 pass
@@ -147,6 +358,7 @@ class AuthClient:
         return self.login()
 
     def logout(self) -> None:
+        self._new_session_generation()
         token_set = self.token_store.load()
         if token_set:
             try:
@@ -154,6 +366,7 @@ class AuthClient:
             except TokenRevocationError:
                 # Best-effort: still clear the local cache even if remote revocation fails.
                 pass
+        self._cache_session(None)
         self.token_store.clear()
 
     def discover_models(self) -> dict:
@@ -165,7 +378,7 @@ class AuthClient:
                 f"{self.base_url}/models", headers=headers, timeout=10
             )
             try:
-                payload = response.json()
+                payload = _response_json(response)
             except ValueError:
                 payload = None
 
@@ -192,6 +405,7 @@ class AuthClient:
             return _perform_request(fresh_session)
 
 
+@functools.lru_cache(maxsize=1)
 def _default_client() -> AuthClient:
     return AuthClient()
 
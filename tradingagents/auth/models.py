@@ -2,13 +2,29 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional
+
+
+class _ExpiryTimestampMixin:
+    """Mirror ``expires_at`` as a Unix timestamp (``expires_at_ts``).
+
+    Expiry checks run on every session lookup and poll iteration; comparing
+    floats from ``time.time()`` avoids building datetimes each time.
+    """
+
+    expires_at_ts: float
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name == "expires_at":
+            object.__setattr__(self, "expires_at_ts", value.timestamp())
 
 
 @dataclass
-class DeviceCodeGrant:
+class DeviceCodeGrant(_ExpiryTimestampMixin):
     """Represents the parameters returned by a device-code initiation call."""
 
     device_code: str
@@ -33,11 +49,11 @@ class DeviceCodeGrant:
         )
 
     def is_expired(self) -> bool:
-        return datetime.now(tz=timezone.utc) >= self.expires_at
+        return time.time() >= self.expires_at_ts
 
 
 @dataclass
-class TokenSet:
+class TokenSet(_ExpiryTimestampMixin):
     """Represents an OAuth access token bundle."""
 
     access_token: str
@@ -59,8 +75,7 @@ class TokenSet:
         )
 
     def is_expired(self, skew_seconds: int = 30) -> bool:
-        margin = timedelta(seconds=skew_seconds)
-        return datetime.now(tz=timezone.utc) >= (self.expires_at - margin)
+        return time.time() >= self.expires_at_ts - skew_seconds
 
     def as_authorization_header(self) -> str:
         return f"{self.token_type.capitalize()} {self.access_token}"
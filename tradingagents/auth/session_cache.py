@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import functools
 import json
 from pathlib import Path
 from typing import Any, Dict
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson is optional
+    orjson = None
+
 
 _CACHE_PATH = Path.home() / ".tradingagents" / "session_config.json"
 
@@ -14,19 +20,37 @@ def save_session_config(data: Dict[str, Any]) -> None:
     """Persist session configuration overrides next to the token cache."""
 
     _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    _CACHE_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    _CACHE_PATH.write_bytes(payload)
+    invalidate_session_config_cache()
 
 
-def load_session_config() -> Dict[str, Any]:
-    """Load cached session configuration overrides if available."""
+def invalidate_session_config_cache() -> None:
+    """Drop the memoized overrides so the next load re-reads the file."""
+
+    _read_session_config.cache_clear()
+
 
+@functools.lru_cache(maxsize=1)
+def _read_session_config() -> Dict[str, Any]:
     if not _CACHE_PATH.exists():
         return {}
     try:
-        raw = json.loads(_CACHE_PATH.read_text(encoding="utf-8"))
+        data = _CACHE_PATH.read_bytes()
+        raw = orjson.loads(data) if orjson is not None else json.loads(data)
     except Exception:
         return {}
 
     if not isinstance(raw, dict):
         return {}
     return raw
+
+
+def load_session_config() -> Dict[str, Any]:
+    """Load cached session configuration overrides if available."""
+
+    # Hand out a copy so callers cannot mutate the memoized overrides.
+    return dict(_read_session_config())
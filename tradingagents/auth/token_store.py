@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
 import os
+import tempfile
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -12,8 +15,27 @@ try:
 except Exception:  # pragma: no cover - keyring may not be installed
     keyring = None
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson is optional
+    orjson = None
+
 from .exceptions import TokenStorageError
-from .models import TokenSet
+from .models import DeviceCodeGrant, TokenSet
+
+
+def _dumps(payload: dict) -> bytes:
+    # orjson encodes datetimes natively (RFC 3339, identical to isoformat()),
+    # so only the stdlib fallback needs them converted up front.
+    if orjson is not None:
+        return orjson.dumps(payload)
+    if isinstance(payload.get("expires_at"), datetime):
+        payload = {**payload, "expires_at": payload["expires_at"].isoformat()}
+    return json.dumps(payload).encode("utf-8")
+
+
+def _loads(serialized: str | bytes) -> dict:
+    return orjson.loads(serialized) if orjson is not None else json.loads(serialized)
 
 
 class TokenStore:
@@ -22,36 +44,61 @@ class TokenStore:
     def __init__(self, *, service_name: str = "tradingagents-auth", file_path: Optional[Path] = None) -> None:
         self.service_name = service_name
         self.file_path = file_path or Path.home() / ".tradingagents" / "auth_tokens.json"
+        self.pending_grant_path = self.file_path.with_name("pending_grant.json")
+        # Last blob read from or written to the keyring. Keyring lookups can be
+        # slow IPC calls, and only this store changes the entry in-process.
+        self._cached_blob: Optional[str] = None
 
     def _load_from_keyring(self) -> Optional[TokenSet]:
         if keyring is None:
             return None
-        serialized = keyring.get_password(self.service_name, "tokens")
-        if not serialized:
-            return None
+        serialized = self._cached_blob
+        if serialized is None:
+            serialized = keyring.get_password(self.service_name, "tokens")
+            if not serialized:
+                return None
+            self._cached_blob = serialized
         return self._deserialize(serialized)
 
     def _save_to_keyring(self, token_set: TokenSet) -> bool:
         if keyring is None:
             return False
-        serialized = self._serialize(token_set)
+        serialized = self._serialize(token_set).decode("utf-8")
         keyring.set_password(self.service_name, "tokens", serialized)
+        self._cached_blob = serialized
         return True
 
-    def _serialize(self, token_set: TokenSet) -> str:
+    @staticmethod
+    def _write_private_file(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename keeps the file intact if we are interrupted. We
+        # deliberately skip fsync: losing the newest token on a crash only
+        # means the user has to log in again.
+        # mkstemp creates a uniquely named file that is already 0o600, so the
+        # secret is never readable by others and concurrent writers never
+        # share a temp file.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+    def _serialize(self, token_set: TokenSet) -> bytes:
         payload = {
             "access_token": token_set.access_token,
             "refresh_token": token_set.refresh_token,
             "token_type": token_set.token_type,
             "scope": token_set.scope,
-            "expires_at": token_set.expires_at.isoformat(),
+            "expires_at": token_set.expires_at,
         }
-        return json.dumps(payload)
-
-    def _deserialize(self, serialized: str) -> TokenSet:
-        data = json.loads(serialized)
-        from datetime import datetime
+        return _dumps(payload)
 
+    def _deserialize(self, serialized: str | bytes) -> TokenSet:
+        data = _loads(serialized)
         expires_at = datetime.fromisoformat(data["expires_at"])
         return TokenSet(
             access_token=data["access_token"],
@@ -61,16 +108,22 @@ class TokenStore:
             expires_at=expires_at,
         )
 
-    def load(self) -> Optional[TokenSet]:
-        """Load tokens from the most secure available backend."""
+    def load(self, *, force_reload: bool = False) -> Optional[TokenSet]:
+        """Load tokens from the most secure available backend.
+
+        Pass ``force_reload=True`` to bypass the in-memory keyring cache, e.g.
+        after another process may have changed the stored tokens.
+        """
 
+        if force_reload:
+            self._cached_blob = None
         try:
             token_set = self._load_from_keyring()
             if token_set:
                 return token_set
 
             if self.file_path.exists():
-                serialized = self.file_path.read_text(encoding="utf-8")
+                serialized = self.file_path.read_bytes()
                 return self._deserialize(serialized)
         except Exception as exc:  # pragma: no cover - safeguard
             raise TokenStorageError("Unable to load authentication tokens") from exc
@@ -83,16 +136,14 @@ class TokenStore:
             if self._save_to_keyring(token_set):
                 return
 
-            self.file_path.parent.mkdir(parents=True, exist_ok=True)
-            serialized = self._serialize(token_set)
-            self.file_path.write_text(serialized, encoding="utf-8")
-            os.chmod(self.file_path, 0o600)
+            self._write_private_file(self.file_path, self._serialize(token_set))
         except Exception as exc:  # pragma: no cover - safeguard
             raise TokenStorageError("Unable to persist authentication tokens") from exc
 
     def clear(self) -> None:
         """Remove any cached tokens."""
 
+        self._cached_blob = None
         try:
             if keyring is not None:
                 try:
@@ -104,3 +155,51 @@ class TokenStore:
                 self.file_path.unlink()
         except Exception as exc:  # pragma: no cover - safeguard
             raise TokenStorageError("Unable to clear persisted authentication tokens") from exc
+
+    def save_pending_grant(self, grant: DeviceCodeGrant) -> None:
+        """Remember an in-progress device-code grant so a retry can resume it."""
+
+        payload = {
+            "device_code": grant.device_code,
+            "user_code": grant.user_code,
+            "verification_uri": grant.verification_uri,
+            "verification_uri_complete": grant.verification_uri_complete,
+            "expires_at": grant.expires_at,
+            "interval": grant.interval,
+        }
+        serialized = _dumps(payload)
+        try:
+            self._write_private_file(self.pending_grant_path, serialized)
+        except Exception as exc:  # pragma: no cover - safeguard
+            raise TokenStorageError("Unable to persist the pending device-code grant") from exc
+
+    def load_pending_grant(self) -> Optional[DeviceCodeGrant]:
+        """Return the persisted device-code grant, if any and still readable."""
+
+        try:
+            serialized = self.pending_grant_path.read_bytes()
+        except OSError:
+            return None
+        try:
+            data = _loads(serialized)
+            return DeviceCodeGrant(
+                device_code=data["device_code"],
+                user_code=data["user_code"],
+                verification_uri=data["verification_uri"],
+                verification_uri_complete=data.get("verification_uri_complete"),
+                expires_at=datetime.fromisoformat(data["expires_at"]),
+                interval=int(data.get("interval", 5)),
+            )
+        except (ValueError, KeyError, TypeError):
+            # A damaged grant is not worth failing login over; start a new one.
+            return None
+
+    def clear_pending_grant(self) -> None:
+        """Forget the persisted device-code grant."""
+
+        try:
+            self.pending_grant_path.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as exc:  # pragma: no cover - safeguard
+            raise TokenStorageError("Unable to clear the pending device-code grant") from exc
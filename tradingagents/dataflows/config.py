@@ -1,33 +1,45 @@
+import types
 import tradingagents.default_config as default_config
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional
 
 # Use default config but allow it to be overridden
 _config: Optional[Dict] = None
+# Read-only view over ``_config``; it tracks updates without copying.
+_config_view: Optional[Mapping] = None
 DATA_DIR: Optional[str] = None
 FINANCIAL_DATA_PROVIDER: Optional[str] = None
 
 
 def initialize_config():
     """Initialize the configuration with default values."""
-    global _config, DATA_DIR, FINANCIAL_DATA_PROVIDER
+    global _config, _config_view, DATA_DIR, FINANCIAL_DATA_PROVIDER
     if _config is None:
         _config = default_config.DEFAULT_CONFIG.copy()
+        _config_view = types.MappingProxyType(_config)
         DATA_DIR = _config["data_dir"]
         FINANCIAL_DATA_PROVIDER = _config.get("financial_data_provider", "finnhub")
 
 
 def set_config(config: Dict):
     """Update the configuration with custom values."""
-    global _config, DATA_DIR, FINANCIAL_DATA_PROVIDER
+    global _config, _config_view, DATA_DIR, FINANCIAL_DATA_PROVIDER
     if _config is None:
         _config = default_config.DEFAULT_CONFIG.copy()
+        _config_view = types.MappingProxyType(_config)
     _config.update(config)
     DATA_DIR = _config["data_dir"]
     FINANCIAL_DATA_PROVIDER = _config.get("financial_data_provider", "finnhub")
 
 
-def get_config() -> Dict:
-    """Get the current configuration."""
+def get_config() -> Mapping:
+    """Get a read-only view of the current configuration."""
+    if _config is None:
+        initialize_config()
+    return _config_view
+
+
+def get_config_mutable() -> Dict:
+    """Get a private, mutable copy of the current configuration."""
     if _config is None:
         initialize_config()
     return _config.copy()
@@ -37,7 +49,7 @@ def get_financial_data_provider() -> str:
     """Return the selected financial data provider."""
     if _config is None:
         initialize_config()
-    return _config.get("financial_data_provider", "finnhub")
+    return _config_view.get("financial_data_provider", "finnhub")
 
 
 # Initialize with default config
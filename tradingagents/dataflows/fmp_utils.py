@@ -2,22 +2,123 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
+import datetime
 import os
-from typing import Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE = "https://financialmodelingprep.com/api"
 FMP_API_KEY = os.getenv("FMP_API_KEY")
 
+# Identical queries are common within one run (e.g. several debate rounds
+# asking for the same news window), so responses are kept for a short while.
+_RESPONSE_CACHE_SIZE = 256
+_RESPONSE_CACHE_TTL = 600
+# Ranges ending today can still gain new items; keep those fresher.
+_RESPONSE_CACHE_TTL_TODAY = 60
+_response_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+# Clock for cache expiry; tests patch this hook rather than time.monotonic.
+_clock = time.monotonic
+
+
+def _build_session() -> requests.Session:
+    # One keep-alive session for the process so successive FMP calls reuse
+    # the same TLS connection instead of handshaking on every request.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _build_session()
+atexit.register(_SESSION.close)
+
+
+def clear_fmp_cache() -> None:
+    """Forget all memoized FMP responses."""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def _response_ttl(params: Dict) -> float:
+    end = params.get("to")
+    if end is not None and str(end) >= datetime.date.today().isoformat():
+        return _RESPONSE_CACHE_TTL_TODAY
+    return _RESPONSE_CACHE_TTL
+
 
 def _call_api(endpoint: str, params: Dict) -> Dict:
     """Call an FMP endpoint and return the parsed JSON response."""
+    key = (endpoint, tuple(sorted(params.items())))
+    now = _clock()
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            expires_at, data = cached
+            if expires_at > now:
+                _response_cache.move_to_end(key)
+                return copy.deepcopy(data)
+            del _response_cache[key]
+
     if FMP_API_KEY:
         params["apikey"] = FMP_API_KEY
-    response = requests.get(f"{API_BASE}/{endpoint}", params=params, timeout=30)
+    response = _SESSION.get(f"{API_BASE}/{endpoint}", params=params, timeout=30)
     response.raise_for_status()
-    return response.json()
+    data = response.json()
+
+    with _response_cache_lock:
+        _response_cache[key] = (now + _response_ttl(params), data)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    # Callers may reshape the result, so never hand out the cached object.
+    return copy.deepcopy(data)
+
+
+def _news_request(ticker: str, start_date: str, end_date: str, period: str | None) -> Tuple[str, Dict]:
+    return "v3/stock_news", {"tickers": ticker, "from": start_date, "to": end_date}
+
+
+def _insider_sentiment_request(ticker: str, start_date: str, end_date: str, period: str | None) -> Tuple[str, Dict]:
+    return "v4/insider-sentiments", {"symbol": ticker, "from": start_date, "to": end_date}
+
+
+def _insider_trading_request(ticker: str, start_date: str, end_date: str, period: str | None) -> Tuple[str, Dict]:
+    return "v4/insider-trading", {"symbol": ticker, "from": start_date, "to": end_date}
+
+
+def _sec_filings_request(ticker: str, start_date: str, end_date: str, period: str | None) -> Tuple[str, Dict]:
+    return f"v3/sec_filings/{ticker}", {"from": start_date, "to": end_date}
+
+
+def _as_reported_request(ticker: str, start_date: str, end_date: str, period: str | None) -> Tuple[str, Dict]:
+    params = {"from": start_date, "to": end_date}
+    if period:
+        params["period"] = period
+    return f"v3/financial-statement-as-reported/{ticker}", params
+
+
+# Maps each supported ``data_type`` to a builder of its (endpoint, params).
+_HANDLERS: Dict[str, Callable[[str, str, str, str | None], Tuple[str, Dict]]] = {
+    "news_data": _news_request,
+    "insider_senti": _insider_sentiment_request,
+    "insider_trans": _insider_trading_request,
+    "SEC_filings": _sec_filings_request,
+    "fin_as_reported": _as_reported_request,
+}
 
 
 def get_data_in_range(
@@ -36,31 +137,8 @@ def get_data_in_range(
     Unknown ``data_type`` values return an empty dictionary.
     """
 
-    if data_type == "news_data":
-        params = {"tickers": ticker, "from": start_date, "to": end_date}
-        news = _call_api("v3/stock_news", params)
-        return {start_date: news}
-
-    if data_type == "insider_senti":
-        params = {"symbol": ticker, "from": start_date, "to": end_date}
-        data = _call_api("v4/insider-sentiments", params)
-        return {start_date: data}
-
-    if data_type == "insider_trans":
-        params = {"symbol": ticker, "from": start_date, "to": end_date}
-        data = _call_api("v4/insider-trading", params)
-        return {start_date: data}
-
-    if data_type == "SEC_filings":
-        params = {"from": start_date, "to": end_date}
-        data = _call_api(f"v3/sec_filings/{ticker}", params)
-        return {start_date: data}
-
-    if data_type == "fin_as_reported":
-        params = {"from": start_date, "to": end_date}
-        if period:
-            params["period"] = period
-        data = _call_api(f"v3/financial-statement-as-reported/{ticker}", params)
-        return {start_date: data}
-
-    return {}
+    handler = _HANDLERS.get(data_type)
+    if handler is None:
+        return {}
+    endpoint, params = handler(ticker, start_date, end_date, period)
+    return {start_date: _call_api(endpoint, params)}
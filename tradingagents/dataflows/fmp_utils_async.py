@@ -0,0 +1,71 @@
+"""Concurrent fetching of several FMP data types for one ticker and range."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List
+
+from .fmp_utils import get_data_in_range
+
+
+async def _fetch(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    data_type: str,
+    data_dir: str,
+    period: str | None,
+):
+    # ``fmp_utils`` already pools connections and memoizes responses, so the
+    # blocking call is simply moved off the event loop.
+    result = await asyncio.to_thread(
+        get_data_in_range, ticker, start_date, end_date, data_type, data_dir, period
+    )
+    return result.get(start_date, {})
+
+
+async def get_data_in_ranges(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    data_types: List[str],
+    data_dir: str,
+    period: str | None = None,
+) -> Dict:
+    """Fetch every ``data_type`` concurrently.
+
+    Returns ``{start_date: {data_type: data}}``. Unknown data types map to an
+    empty dictionary. If any request fails, the first error is re-raised once
+    all requests have finished.
+    """
+
+    results = await asyncio.gather(
+        *(
+            _fetch(ticker, start_date, end_date, data_type, data_dir, period)
+            for data_type in data_types
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return {start_date: dict(zip(data_types, results))}
+
+
+def get_data_in_ranges_sync(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    data_types: List[str],
+    data_dir: str,
+    period: str | None = None,
+) -> Dict:
+    """Blocking wrapper around :func:`get_data_in_ranges`.
+
+    Must not be called from a running event loop; await
+    :func:`get_data_in_ranges` there instead.
+    """
+
+    return asyncio.run(
+        get_data_in_ranges(ticker, start_date, end_date, data_types, data_dir, period)
+    )
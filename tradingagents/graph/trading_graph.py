@@ -4,7 +4,7 @@ import os
 from pathlib import Path
 import json
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional, Iterable
+from typing import Dict, Any, Tuple, List, Mapping, Optional, Iterable
 
 from tradingagents.portfolio import Portfolio, PortfolioOptimizer
 
@@ -297,7 +297,7 @@ class TradingAgentsGraph:
             except Exception:
                 pass
 
-    def rebalance(self, price_histories: Dict[str, Iterable[float]]) -> Tuple[Dict[str, float], Tuple[float, float]]:
+    def rebalance(self, price_histories: Dict[str, Iterable[float]]) -> Tuple[Mapping[str, float], Tuple[float, float]]:
         """Optimize portfolio allocation based on price histories."""
         adjustments, metrics = self.optimizer.optimize(self.portfolio, price_histories)
         dt = date.today()
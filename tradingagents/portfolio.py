@@ -1,11 +1,25 @@
 from __future__ import annotations
 
+import array
+import math
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Iterable, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Iterator, Mapping, NamedTuple, Sequence, Tuple
 
+import numpy as np
 
-@dataclass
+if sys.version_info >= (3, 13):  # pragma: no cover - the suite runs on older Pythons
+    from math import fma as _fma
+else:
+
+    def _fma(x: float, y: float, z: float) -> float:
+        # math.fma is new in Python 3.13.
+        return x * y + z
+
+
+@dataclass(slots=True)
 class Transaction:
     date: datetime
     symbol: str
@@ -14,95 +28,483 @@ class Transaction:
     type: str  # BUY, SELL, DEPOSIT, WITHDRAW
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
+    """Snapshot of an open position; change it through ``buy``/``sell``."""
+
     symbol: str
     quantity: float
     average_price: float
 
 
+_INITIAL_CAPACITY = 8
+
+_TX_TYPES = ("BUY", "SELL", "DEPOSIT", "WITHDRAW")
+_TX_BUY, _TX_SELL, _TX_DEPOSIT, _TX_WITHDRAW = range(len(_TX_TYPES))
+_TX_CODES = {name: code for code, name in enumerate(_TX_TYPES)}
+
+
+class _PositionsView(Mapping[str, Position]):
+    """Read-only mapping of symbols to immutable :class:`Position` snapshots."""
+
+    __slots__ = ("_portfolio",)
+
+    def __init__(self, portfolio: "Portfolio") -> None:
+        self._portfolio = portfolio
+
+    def __getitem__(self, symbol: str) -> Position:
+        portfolio = self._portfolio
+        i = portfolio._index[symbol]
+        return Position(
+            symbol,
+            float(portfolio._quantities[i]),
+            float(portfolio._avg_prices[i]),
+        )
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._portfolio._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._portfolio._symbols)
+
+    def __len__(self) -> int:
+        return len(self._portfolio._symbols)
+
+
+class Journal:
+    """Column-wise transaction ledger.
+
+    Each field lives in its own typed buffer (numeric columns in
+    ``array.array``), so appending allocates no per-record objects and numeric
+    scans run over contiguous memory.
+    """
+
+    __slots__ = ("_dates", "_symbols", "_quantities", "_prices", "_types")
+
+    def __init__(self) -> None:
+        self._dates: List[datetime] = []
+        self._symbols: List[str] = []
+        self._quantities = array.array("d")
+        self._prices = array.array("d")
+        self._types = array.array("B")
+
+    def append(self, date: datetime, symbol: str, quantity: float, price: float, type: str) -> None:
+        """Record a transaction; ``type`` is one of BUY, SELL, DEPOSIT, WITHDRAW."""
+        self._append(date, symbol, quantity, price, _TX_CODES[type])
+
+    def _append(self, date: datetime, symbol: str, quantity: float, price: float, type_code: int) -> None:
+        self._dates.append(date)
+        self._symbols.append(symbol)
+        self._quantities.append(quantity)
+        self._prices.append(price)
+        self._types.append(type_code)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def record(self, i: int) -> Transaction:
+        """Return the ``i``-th transaction as a :class:`Transaction`."""
+        return Transaction(
+            self._dates[i],
+            self._symbols[i],
+            self._quantities[i],
+            self._prices[i],
+            _TX_TYPES[self._types[i]],
+        )
+
+    def quantities(self) -> np.ndarray:
+        """Signed quantity of every transaction (amounts for cash moves)."""
+        # Copy rather than wrap the buffer: a live view would stop the
+        # array from growing on the next append.
+        return np.array(self._quantities, dtype=np.float64)
+
+    def prices(self) -> np.ndarray:
+        """Price of every transaction (0 for deposits and withdrawals)."""
+        return np.array(self._prices, dtype=np.float64)
+
+    def notional(self) -> np.ndarray:
+        """Signed traded value ``quantity * price`` of every transaction."""
+        return self.quantities() * self.prices()
+
+    def as_transactions(self) -> Iterator[Transaction]:
+        """Yield every transaction in order."""
+        for row in zip(self._dates, self._symbols, self._quantities, self._prices, self._types):
+            yield Transaction(row[0], row[1], row[2], row[3], _TX_TYPES[row[4]])
+
+
+class _HistoryView(Sequence[Transaction]):
+    """Read-only sequence of :class:`Transaction` records built on access."""
+
+    __slots__ = ("_journal",)
+
+    def __init__(self, journal: Journal) -> None:
+        self._journal = journal
+
+    def __getitem__(self, index):
+        journal = self._journal
+        if isinstance(index, slice):
+            return [journal.record(i) for i in range(*index.indices(len(journal)))]
+        n = len(journal)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("transaction index out of range")
+        return journal.record(index)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return self._journal.as_transactions()
+
+    def __len__(self) -> int:
+        return len(self._journal)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+
 @dataclass
 class Portfolio:
     cash: float = 0.0
-    positions: Dict[str, Position] = field(default_factory=dict)
-    history: List[Transaction] = field(default_factory=list)
+    # Every deposit, withdrawal and trade; ``history`` is a record view of it.
+    journal: Journal = field(default_factory=Journal, init=False, repr=False, compare=False)
+    # Positions are stored column-wise: parallel quantity/average-price arrays
+    # (valid up to len(_symbols)) plus a symbol -> row index.
+    _symbols: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _quantities: np.ndarray = field(
+        default_factory=lambda: np.zeros(_INITIAL_CAPACITY),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _avg_prices: np.ndarray = field(
+        default_factory=lambda: np.zeros(_INITIAL_CAPACITY),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    # Bumped on every position change; keys the ``_as_arrays`` memo.
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _arrays: Tuple[int, Tuple[str, ...], np.ndarray, np.ndarray] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Market value of the positions at ``_last_prices``; valid while
+    # ``_mv_version`` equals ``_version`` so trades force a full recompute.
+    _mv: float = field(default=0.0, init=False, repr=False, compare=False)
+    _mv_version: int = field(default=-1, init=False, repr=False, compare=False)
+    _last_prices: Dict[str, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    # The column fields are excluded from the generated methods, so compare
+    # and show the portfolio by its logical state instead.
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Portfolio):
+            return NotImplemented
+        return (self.cash, dict(self.positions), list(self.history)) == (
+            other.cash,
+            dict(other.positions),
+            list(other.history),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(cash={self.cash!r}, "
+            f"positions={dict(self.positions)!r}, transactions={len(self.journal)})"
+        )
+
+    @property
+    def positions(self) -> Mapping[str, Position]:
+        """Open positions keyed by symbol (a read-only view)."""
+        return _PositionsView(self)
+
+    @property
+    def history(self) -> Sequence[Transaction]:
+        """All recorded transactions in order (a read-only view)."""
+        return _HistoryView(self.journal)
+
+    def _as_arrays(self) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+        """Return ``(symbols, quantities, average_prices)`` for open positions.
+
+        The arrays are read-only views trimmed to the open positions; the
+        result is reused until the next buy or sell.
+        """
+        cached = self._arrays
+        if cached is not None and cached[0] == self._version:
+            return cached[1:]
+        n = len(self._symbols)
+        quantities = self._quantities[:n]
+        avg_prices = self._avg_prices[:n]
+        quantities.flags.writeable = False
+        avg_prices.flags.writeable = False
+        self._arrays = (self._version, tuple(self._symbols), quantities, avg_prices)
+        return self._arrays[1:]
+
+    def _add_position(self, symbol: str, quantity: float, price: float) -> None:
+        n = len(self._symbols)
+        if n == len(self._quantities):
+            capacity = 2 * n
+            quantities = np.zeros(capacity)
+            quantities[:n] = self._quantities
+            avg_prices = np.zeros(capacity)
+            avg_prices[:n] = self._avg_prices
+            self._quantities, self._avg_prices = quantities, avg_prices
+        self._symbols.append(symbol)
+        self._index[symbol] = n
+        self._quantities[n] = quantity
+        self._avg_prices[n] = price
+
+    def _remove_position(self, i: int) -> None:
+        # Shift the following rows down so positions keep their insertion order.
+        n = len(self._symbols)
+        del self._index[self._symbols.pop(i)]
+        self._quantities[i : n - 1] = self._quantities[i + 1 : n]
+        self._avg_prices[i : n - 1] = self._avg_prices[i + 1 : n]
+        for j in range(i, n - 1):
+            self._index[self._symbols[j]] = j
 
     def deposit(self, amount: float, date: datetime) -> None:
         self.cash += amount
-        self.history.append(Transaction(date, "", amount, 0.0, "DEPOSIT"))
+        self.journal._append(date, "", amount, 0.0, _TX_DEPOSIT)
 
     def withdraw(self, amount: float, date: datetime) -> None:
         if amount > self.cash:
             raise ValueError("Insufficient cash")
         self.cash -= amount
-        self.history.append(Transaction(date, "", -amount, 0.0, "WITHDRAW"))
+        self.journal._append(date, "", -amount, 0.0, _TX_WITHDRAW)
 
     def buy(self, symbol: str, quantity: float, price: float, date: datetime) -> None:
         total = quantity * price
         if total > self.cash:
             raise ValueError("Insufficient cash to buy")
         self.cash -= total
-        pos = self.positions.get(symbol)
-        if pos:
-            new_qty = pos.quantity + quantity
-            pos.average_price = (pos.average_price * pos.quantity + price * quantity) / new_qty
-            pos.quantity = new_qty
+        self._version += 1
+        i = self._index.get(symbol)
+        if i is None:
+            self._add_position(symbol, quantity, price)
         else:
-            self.positions[symbol] = Position(symbol, quantity, price)
-        self.history.append(Transaction(date, symbol, quantity, price, "BUY"))
+            # Work on Python floats; NumPy scalar arithmetic is far slower.
+            quantities, avg_prices = self._quantities, self._avg_prices
+            held = quantities.item(i)
+            new_qty = held + quantity
+            # One fused multiply-add (a single rounding) where available.
+            avg_prices[i] = _fma(avg_prices.item(i), held, price * quantity) / new_qty
+            quantities[i] = new_qty
+        self.journal._append(date, symbol, quantity, price, _TX_BUY)
 
     def sell(self, symbol: str, quantity: float, price: float, date: datetime) -> None:
-        pos = self.positions.get(symbol)
-        if not pos or pos.quantity < quantity:
+        i = self._index.get(symbol)
+        held = self._quantities.item(i) if i is not None else 0.0
+        if i is None or held < quantity:
             raise ValueError("Insufficient shares to sell")
-        pos.quantity -= quantity
+        remaining = held - quantity
         self.cash += quantity * price
-        if pos.quantity == 0:
-            del self.positions[symbol]
-        self.history.append(Transaction(date, symbol, -quantity, price, "SELL"))
+        self._version += 1
+        if remaining == 0:
+            self._remove_position(i)
+        else:
+            self._quantities[i] = remaining
+        self.journal._append(date, symbol, -quantity, price, _TX_SELL)
 
     def total_value(self, prices: Dict[str, float]) -> float:
-        value = self.cash
-        for sym, pos in self.positions.items():
-            value += pos.quantity * prices.get(sym, pos.average_price)
-        return value
+        if self._mv_version == self._version:
+            # Only symbols whose price moved since the last call adjust the
+            # cached market value.
+            index = self._index
+            last_prices = self._last_prices
+            quantities = self._quantities
+            mv = self._mv
+            priced = 0
+            for sym, price in prices.items():
+                i = index.get(sym)
+                if i is None:
+                    continue
+                priced += 1
+                old = last_prices[sym]
+                if price != old:
+                    mv += float(quantities[i]) * (price - old)
+                    last_prices[sym] = price
+            if priced == len(index) and math.isfinite(mv):
+                self._mv = mv
+                return self.cash + mv
 
+        symbols, quantities, avg_prices = self._as_arrays()
+        price_vec = np.fromiter(
+            (prices.get(sym, avg) for sym, avg in zip(symbols, avg_prices.tolist())),
+            dtype=np.float64,
+            count=len(symbols),
+        )
+        mv = float(quantities @ price_vec)
+        # Unpriced positions fall back to their average price, which is not a
+        # mark we can update incrementally, so only cache fully priced calls.
+        if all(sym in prices for sym in symbols):
+            self._last_prices = dict(zip(symbols, price_vec.tolist()))
+            self._mv = mv
+            self._mv_version = self._version
+        else:
+            self._mv_version = -1
+        return self.cash + mv
 
-def portfolio_performance(portfolio: Portfolio, price_histories: Dict[str, Iterable[float]]) -> Tuple[float, float]:
-    """Return estimated (return, risk) for the portfolio.
 
-    price_histories maps symbols to a sequence of prices where the first and last
-    elements represent the evaluation window.
+def _weighted_return_variance_py(scaled: np.ndarray, returns: np.ndarray) -> Tuple[float, float]:
+    weighted_return = float(scaled @ returns)
+    variance = float(scaled @ (returns - weighted_return) ** 2)
+    return weighted_return, variance
+
+
+def _weighted_return_variance_loop(scaled, returns):
+    # Loop form for numba: two passes over contiguous memory, no temporaries.
+    mean = 0.0
+    for i in range(scaled.size):
+        mean += scaled[i] * returns[i]
+    variance = 0.0
+    for i in range(scaled.size):
+        d = returns[i] - mean
+        variance += scaled[i] * d * d
+    return mean, variance
+
+
+_weighted_return_variance = None
+
+
+def _get_weighted_return_variance():
+    """Return the reduction kernel, compiling it with numba on first use.
+
+    numba is imported lazily so importing this module (and every CLI command
+    that pulls it in) does not pay for loading the JIT.
     """
-    weights: Dict[str, float] = {}
-    total = portfolio.cash
-    for sym, pos in portfolio.positions.items():
-        last_price = price_histories.get(sym, [pos.average_price])[-1]
-        w = pos.quantity * last_price
-        weights[sym] = w
-        total += w
+    global _weighted_return_variance
+    kernel = _weighted_return_variance
+    if kernel is None:
+        try:
+            from numba import njit  # type: ignore
+        except Exception:  # pragma: no cover - numba is optional
+            kernel = _weighted_return_variance_py
+        else:
+            # The explicit signature compiles once (or loads from the
+            # on-disk cache) rather than specializing per call site.
+            kernel = njit(
+                "UniTuple(float64, 2)(float64[::1], float64[::1])", cache=True, fastmath=True
+            )(_weighted_return_variance_loop)
+        _weighted_return_variance = kernel
+    return kernel
+
+
+@dataclass(slots=True, frozen=True)
+class PriceEndpoints:
+    """First and last price of a history plus its length.
+
+    Accepted in place of a full price history by :func:`portfolio_performance`,
+    which only reads the endpoints. Deliberately not a tuple, so it can never
+    be mistaken for a short price series.
+    """
+
+    first: float
+    last: float
+    count: int
+
+
+def precompute_endpoints(price_histories: Mapping[str, Sequence[float]]) -> Dict[str, PriceEndpoints]:
+    """Reduce non-empty histories to their :class:`PriceEndpoints`."""
+    return {
+        sym: PriceEndpoints(hist[0], hist[-1], len(hist))
+        for sym, hist in price_histories.items()
+        if len(hist) >= 1
+    }
+
+
+PriceData = Dict[str, Sequence[float] | PriceEndpoints]
+
+
+class _PositionPrices(NamedTuple):
+    """Open positions aligned with the price data looked up for them."""
+
+    symbols: Tuple[str, ...]
+    quantities: np.ndarray
+    histories: List[Sequence[float] | PriceEndpoints | None]
+    last_prices: np.ndarray  # latest price, or the average price if unknown
+    has_return: np.ndarray  # True where the history holds at least two prices
+
+
+def _position_prices(portfolio: Portfolio, price_histories: PriceData) -> _PositionPrices:
+    symbols, quantities, avg_prices = portfolio._as_arrays()
+    n = len(symbols)
+    # Look every history up once; all per-symbol arrays are derived from it.
+    histories = [price_histories.get(sym) for sym in symbols]
+    # len() rather than truthiness, so NumPy arrays work too; a missing or
+    # empty history falls back to the average price.
+    lengths = [
+        0 if hist is None else hist.count if type(hist) is PriceEndpoints else len(hist)
+        for hist in histories
+    ]
+    last_prices = np.fromiter(
+        (
+            avg if length == 0 else hist.last if type(hist) is PriceEndpoints else hist[-1]
+            for hist, length, avg in zip(histories, lengths, avg_prices.tolist())
+        ),
+        dtype=np.float64,
+        count=n,
+    )
+    has_return = np.fromiter((length >= 2 for length in lengths), dtype=bool, count=n)
+    return _PositionPrices(symbols, quantities, histories, last_prices, has_return)
+
+
+def _performance(cash: float, data: _PositionPrices) -> Tuple[float, float]:
+    weights = data.quantities * data.last_prices
+    total = cash + float(weights.sum())
 
     if total == 0:
         return 0.0, 0.0
 
-    returns: Dict[str, float] = {}
-    for sym, hist in price_histories.items():
-        if len(hist) >= 2:
-            returns[sym] = (hist[-1] - hist[0]) / hist[0]
+    # Only positions with at least two prices contribute a return estimate.
+    has_return = data.has_return
+    first = np.fromiter(
+        (
+            hist.first if type(hist) is PriceEndpoints else hist[0]
+            for hist, ok in zip(data.histories, has_return.tolist())
+            if ok
+        ),
+        dtype=np.float64,
+        count=int(has_return.sum()),
+    )
+    returns = (data.last_prices[has_return] - first) / first
+    inv_total = 1.0 / total
+    scaled = weights[has_return] * inv_total
 
-    weighted_return = 0.0
-    for sym, w in weights.items():
-        if sym in returns:
-            weighted_return += (w / total) * returns[sym]
+    weighted_return, variance = _get_weighted_return_variance()(scaled, returns)
 
-    mean = weighted_return
-    variance = 0.0
-    for sym, w in weights.items():
-        if sym in returns:
-            variance += (w / total) * (returns[sym] - mean) ** 2
+    # Clamp rounding noise below zero so sqrt() stays in the real domain.
+    risk = math.sqrt(max(variance, 0.0))
+    return float(weighted_return), risk
+
+
+def portfolio_performance(portfolio: Portfolio, price_histories: PriceData) -> Tuple[float, float]:
+    """Return estimated (return, risk) for the portfolio.
 
-    risk = variance ** 0.5
-    return weighted_return, risk
+    price_histories maps symbols to a sequence of prices where the first and last
+    elements represent the evaluation window, or to precomputed
+    :class:`PriceEndpoints` (see :func:`precompute_endpoints`).
+    """
+    return _performance(portfolio.cash, _position_prices(portfolio, price_histories))
+
+
+_COV_RIDGE = 1e-6
+
+# Returned by the optimizer when no position needs to change.
+_NO_ADJUSTMENTS: Mapping[str, float] = MappingProxyType({})
+
+
+def get_adjustment(adjustments: Mapping[str, float], symbol: str) -> float:
+    """Suggested quantity change for ``symbol`` (0.0 if none)."""
+    return adjustments.get(symbol, 0.0)
+
+
+def _project_to_simplex(v: np.ndarray) -> np.ndarray:
+    """Euclidean projection of ``v`` onto ``{w : w >= 0, sum(w) == 1}``."""
+    u = np.sort(v)[::-1]
+    css = np.cumsum(u) - 1.0
+    ks = np.arange(1, len(v) + 1)
+    rho = np.flatnonzero(u - css / ks > 0)[-1]
+    return np.maximum(v - css[rho] / (rho + 1), 0.0)
 
 
 class PortfolioOptimizer:
@@ -115,58 +517,63 @@ class PortfolioOptimizer:
     def optimize(
         self,
         portfolio: Portfolio,
-        price_histories: Dict[str, Iterable[float]],
-    ) -> Tuple[Dict[str, float], Tuple[float, float]]:
-        """Return suggested quantity changes and (return, risk)."""
-        import numpy as np
-
-        ret, risk = portfolio_performance(portfolio, price_histories)
-        symbols = list(portfolio.positions.keys())
-        adjustments: Dict[str, float] = {sym: 0.0 for sym in symbols}
-
-        # Gather return series for each symbol
-        returns_data = []
-        used_symbols = []
-        for sym in symbols:
-            hist = price_histories.get(sym)
-            if hist is None or len(hist) < 2:
-                continue
-            arr = np.asarray(hist, dtype=float)
-            returns = np.diff(arr) / arr[:-1]
-            returns_data.append(returns)
-            used_symbols.append(sym)
-
-        if len(returns_data) >= 2:
-            ret_matrix = np.array(returns_data)
+        price_histories: PriceData,
+    ) -> Tuple[Mapping[str, float], Tuple[float, float]]:
+        """Return suggested quantity changes and (return, risk).
+
+        Symbols without a suggested change may be absent from the mapping; read
+        it with :func:`get_adjustment`. When nothing needs to change, a shared
+        empty read-only mapping is returned.
+        """
+        # Resolve every position's prices once and share them between the
+        # performance estimate and the allocation below.
+        data = _position_prices(portfolio, price_histories)
+        ret, risk = _performance(portfolio.cash, data)
+
+        # The covariance needs full series; symbols given only as endpoints
+        # still count towards the performance estimate above.
+        used = [
+            i
+            for i in np.flatnonzero(data.has_return).tolist()
+            if type(data.histories[i]) is not PriceEndpoints
+        ]
+        if len(used) >= 2:
+            used_symbols = [data.symbols[i] for i in used]
+            # Stack all histories into one (n_symbols, n_steps) matrix and derive
+            # every return series in a single pass. Ragged histories are aligned
+            # on their most recent common window.
+            histories = [data.histories[i] for i in used]
+            steps = min(len(hist) for hist in histories)
+            prices = np.empty((len(histories), steps), dtype=np.float64)
+            for row, hist in zip(prices, histories):
+                row[:] = hist[len(hist) - steps :]
+            ret_matrix = np.diff(prices, axis=1)
+            ret_matrix /= prices[:, :-1]
             mu = ret_matrix.mean(axis=1)
-            cov = np.cov(ret_matrix)
+            # A small ridge keeps the system well conditioned (and solvable)
+            # when histories are short or assets move in lockstep.
+            cov = np.cov(ret_matrix) + _COV_RIDGE * np.eye(len(used_symbols))
             try:
-                inv_cov = np.linalg.inv(cov)
+                raw = np.linalg.solve(cov, mu)
             except np.linalg.LinAlgError:
-                inv_cov = np.linalg.pinv(cov)
+                raw, *_ = np.linalg.lstsq(cov, mu, rcond=None)
 
-            weights = inv_cov @ mu
-            if weights.sum() != 0:
-                weights = weights / weights.sum()
-            port_risk = float(np.sqrt(weights.T @ cov @ weights))
+            # Long-only and fully invested, then scaled down (the remainder
+            # left in cash) if the allocation breaches the risk cap.
+            weights = _project_to_simplex(np.nan_to_num(raw))
+            port_risk = float(np.sqrt(weights @ cov @ weights))
             if port_risk > self.max_risk and port_risk > 0:
                 weights = weights * (self.max_risk / port_risk)
-                weights = weights / weights.sum()
-
-            total_invested = sum(
-                portfolio.positions[sym].quantity
-                * price_histories[sym][-1]
-                for sym in used_symbols
-            )
-            for w, sym in zip(weights, used_symbols):
-                target_val = w * total_invested
-                price = price_histories[sym][-1]
-                target_qty = target_val / price
-                adjustments[sym] = target_qty - portfolio.positions[sym].quantity
-        else:
-            # Fallback to simple logic when data is insufficient
-            if risk > self.max_risk or ret < self.target_return:
-                for sym, pos in portfolio.positions.items():
-                    adjustments[sym] = -0.5 * pos.quantity
 
-        return adjustments, (ret, risk)
+            held = data.quantities[used]
+            last_prices = data.last_prices[used]
+            total_invested = float(held @ last_prices)
+            targets = weights * total_invested / last_prices - held
+            adjustments = dict.fromkeys(data.symbols, 0.0)
+            adjustments.update(zip(used_symbols, targets.tolist()))
+            return adjustments, (ret, risk)
+
+        # Fallback to simple logic when data is insufficient
+        if risk > self.max_risk or ret < self.target_return:
+            return dict(zip(data.symbols, (-0.5 * data.quantities).tolist())), (ret, risk)
+        return _NO_ADJUSTMENTS, (ret, risk)